@@ -81,6 +81,7 @@ LOCAL_APPS = [
     "ride.users.apps.UsersAppConfig",
     "ride.circles.apps.CirclesAppConfig",
     "ride.rides.apps.RidesAppConfig",
+    "ride.taskapp.apps.TaskAppConfig",
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -128,6 +129,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "ride.utils.middleware.QueryMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -277,12 +279,37 @@ SOCIALACCOUNT_ADAPTER = "ride.users.adapters.SocialAccountAdapter"
 # Your stuff...
 # ------------------------------------------------------------------------------
 
+# Buffer stats counters in Redis and write them with flush_counters
+COUNTERS_BUFFERED = env.bool("DJANGO_COUNTERS_BUFFERED", False)
+
+# Fail the running test when a view goes over its query budget
+QUERY_BUDGETS_STRICT = env.bool("DJANGO_QUERY_BUDGETS_STRICT", False)
+
+# Signed access tokens: key id to secret, the SECRET_KEY if empty.
+# New tokens are signed with JWT_SIGNING_KEY_ID, the first key by default
+JWT_SIGNING_KEYS = env.dict("DJANGO_JWT_SIGNING_KEYS", default={})
+JWT_SIGNING_KEY_ID = env("DJANGO_JWT_SIGNING_KEY_ID", default="")
+# Lifetimes in seconds
+JWT_ACCESS_TOKEN_LIFETIME = env.int("DJANGO_JWT_ACCESS_TOKEN_LIFETIME", 15 * 60)
+JWT_REFRESH_TOKEN_LIFETIME = env.int(
+    "DJANGO_JWT_REFRESH_TOKEN_LIFETIME", 7 * 24 * 60 * 60
+)
+# Cache holding the revoked tokens, it must raise its connection errors
+# so tokens are rejected rather than accepted when it is down
+JWT_CACHE = "default"
+
 # Django REST framework
 
 REST_FRAMEWORK = {
-    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+    "DEFAULT_RENDERER_CLASSES": ("ride.utils.renderers.FastJSONRenderer",),
+    "DEFAULT_PARSER_CLASSES": (
+        "ride.utils.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.TokenAuthentication",
+        "ride.users.authentication.CachedTokenAuthentication",
+        "ride.users.authentication.JWTAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 3,
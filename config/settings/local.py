@@ -58,3 +58,5 @@ INSTALLED_APPS += ["django_extensions"]  # noqa F405
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Development only apps
+INSTALLED_APPS += ["ride.benchmarks.apps.BenchmarksAppConfig"]  # noqa F405
@@ -26,8 +26,15 @@ CACHES = {
             # https://github.com/jazzband/django-redis#memcached-exceptions-behavior
             "IGNORE_EXCEPTIONS": True,
         },
-    }
+    },
+    # Token revocations, errors are not ignored so tokens fail closed
+    "tokens": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": env("REDIS_URL"),
+        "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+    },
 }
+JWT_CACHE = "tokens"
 
 # SECURITY
 # ------------------------------------------------------------------------------
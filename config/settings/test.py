@@ -39,3 +39,7 @@ EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Development only apps
+INSTALLED_APPS += ["ride.benchmarks.apps.BenchmarksAppConfig"]  # noqa F405
+# Fail tests that go over a view's query budget
+QUERY_BUDGETS_STRICT = True
@@ -5,6 +5,8 @@ from django.urls import include, path
 from django.views import defaults as default_views
 from django.views.generic import TemplateView
 
+from ride.utils.views import MetricsView
+
 urlpatterns = [
     # Django Admin, use {% url 'admin:index' %}
     path(settings.ADMIN_URL, admin.site.urls),
@@ -12,6 +14,7 @@ urlpatterns = [
     path("", include(("ride.circles.urls", "circles"), namespace="circles")),
     path("", include(("ride.users.urls", "users"), namespace="users")),
     path("", include(("ride.rides.urls", "rides"), namespace="rides")),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 
@@ -0,0 +1,11 @@
+"""Benchmarks app
+Development only: its commands seed data with the test factories, which
+need the packages in requirements/local.txt
+"""
+
+from django.apps import AppConfig
+
+
+class BenchmarksAppConfig(AppConfig):
+    name = "ride.benchmarks"
+    verbose_name = "Benchmarks"
@@ -0,0 +1,356 @@
+"""Benchmark the API"""
+
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+from datetime import timedelta
+
+# Django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+# Factory boy
+import factory.random
+
+# Django REST Framework
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+# Models
+from ride.circles.models import Circle
+from ride.users.models import User
+
+# Factories
+from ride.circles.tests.factories import CircleFactory, MembershipFactory
+from ride.rides.tests.factories import RideFactory, RatingFactory
+from ride.users.tests.factories import PASSWORD
+
+# Utilities
+from ride.utils import metrics
+from ride.utils.cache import clear_caches
+
+SCENARIOS = ("signup", "login", "circles", "rides", "search", "join", "finish", "rate")
+
+
+def percentile(ordered, p):
+    """Return the nearest rank `p` percentile of sorted values"""
+    rank = max(math.ceil(p / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def git_commit():
+    """Return the commit of the working tree, if any"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+class Command(BaseCommand):
+    """Seed a synthetic dataset with the factories and time the main API
+    actions through DRF's test client, in process. Each scenario reports
+    its throughput, latency percentiles and queries per request as JSON,
+    with the commit and options, so runs can be compared across commits.
+
+    The dataset only depends on the options, so the command needs an
+    empty database, such as a freshly migrated one. Everything runs in a
+    transaction rolled back at the end, so commits are not part of the
+    timings, and the cache is cleared before and after the run. Never
+    point it at production.
+    """
+
+    help = "Measure the throughput and latency of the API on a synthetic dataset"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--circles", type=int, default=3, help="Circles to seed")
+        parser.add_argument(
+            "--members", type=int, default=30, help="Members seeded per circle"
+        )
+        parser.add_argument(
+            "--rides", type=int, default=100, help="Rides seeded per circle"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=100, help="Requests per scenario"
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=SCENARIOS,
+            dest="scenarios",
+            help="Scenario to run, may be repeated, all of them by default",
+        )
+        parser.add_argument("--output", help="Write the report to this file")
+
+    def handle(self, *args, **options):
+        if options["members"] < 5:
+            raise CommandError("At least 5 members per circle are needed")
+        if User.objects.exists() or Circle.objects.exists():
+            raise CommandError("The database must be empty, try a freshly migrated one")
+
+        self.rng = random.Random(options["seed"])
+        factory.random.reseed_random(options["seed"])
+        scenarios = options["scenarios"] or SCENARIOS
+        allowed_hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+
+        clear_caches()
+        try:
+            with override_settings(ALLOWED_HOSTS=allowed_hosts), transaction.atomic():
+                dataset = self.seed(options)
+                results = {
+                    name: self.run(name, getattr(self, f"plan_{name}")(dataset))
+                    for name in scenarios
+                }
+                transaction.set_rollback(True)
+        finally:
+            clear_caches()
+
+        report = {
+            "commit": git_commit(),
+            "created": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "options": {
+                key: options[key]
+                for key in ("circles", "members", "rides", "requests", "seed")
+            },
+            "scenarios": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def seed(self, options):
+        """Create the circles, their members, rides, passengers and
+        ratings, and the rides consumed by the write scenarios
+        """
+        requests = options["requests"]
+        now = timezone.now()
+        circles = []
+        for circle in CircleFactory.create_batch(options["circles"]):
+            members = [
+                membership.user
+                for membership in MembershipFactory.create_batch(
+                    options["members"], circle=circle
+                )
+            ]
+            for i in range(options["rides"]):
+                driver, *others = self.rng.sample(members, 4)
+                passengers = others[: self.rng.randint(0, 3)]
+                ride = RideFactory(
+                    offered_by=driver,
+                    offered_in=circle,
+                    available_seats=4,
+                    passengers=passengers,
+                )
+                if passengers and i % 2:
+                    RatingFactory(ride=ride, rating_user=passengers[0])
+            circles.append((circle, members))
+
+        users = [user for _, members in circles for user in members]
+        tokens = Token.objects.bulk_create(
+            [Token(user=user, key=Token.generate_key()) for user in users]
+        )
+
+        # Rides consumed by the write scenarios, one per request
+        writes = {"join": [], "finish": [], "rate": []}
+        for i in range(requests):
+            circle, members = circles[i % len(circles)]
+            driver, passenger = self.rng.sample(members, 2)
+            past = now - timedelta(hours=2)
+            rides = {
+                "join": RideFactory(
+                    offered_by=driver, offered_in=circle, available_seats=4
+                ),
+                "finish": RideFactory(
+                    offered_by=driver,
+                    offered_in=circle,
+                    departure_date=past,
+                    arrival_date=past + timedelta(minutes=45),
+                ),
+                "rate": RideFactory(
+                    offered_by=driver,
+                    offered_in=circle,
+                    available_seats=3,
+                    passengers=[passenger],
+                ),
+            }
+            for name, ride in rides.items():
+                writes[name].append((circle, driver, passenger, ride))
+
+        return {
+            "requests": requests,
+            "circles": circles,
+            "tokens": {token.user_id: token.key for token in tokens},
+            "writes": writes,
+        }
+
+    def run(self, name, requests):
+        """Send the (method, path, data, token, expected status) requests
+        of a scenario and summarize their timings
+        """
+        client = APIClient()
+        clear_caches()
+        metrics.reset()
+        latencies = []
+        errors = 0
+        start = time.perf_counter()
+        for method, path, data, token, expected in requests:
+            headers = {}
+            if token is not None:
+                headers["HTTP_AUTHORIZATION"] = f"Token {token}"
+            sent = time.perf_counter()
+            response = getattr(client, method)(path, data, format="json", **headers)
+            latencies.append(time.perf_counter() - sent)
+            if response.status_code != expected:
+                if not errors:
+                    self.stderr.write(
+                        f"{name}: {method.upper()} {path} returned "
+                        f"{response.status_code} {response.content[:200]!r}"
+                    )
+                errors += 1
+        elapsed = time.perf_counter() - start
+
+        ordered = sorted(latencies)
+        result = {
+            "requests": len(ordered),
+            "errors": errors,
+            "throughput": round(len(ordered) / elapsed, 2) if ordered else 0,
+        }
+        if ordered:
+            result.update(
+                {
+                    "mean_ms": round(sum(ordered) * 1000 / len(ordered), 3),
+                    "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+                    "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+                    "max_ms": round(ordered[-1] * 1000, 3),
+                }
+            )
+        endpoints = metrics.snapshot()
+        result["queries"] = {
+            endpoint: stats["queries"] for endpoint, stats in endpoints.items()
+        }
+        return result
+
+    def sample_members(self, dataset):
+        """Return a (circle, member) pair per request, picked at random"""
+        pairs = []
+        for _ in range(dataset["requests"]):
+            circle, members = self.rng.choice(dataset["circles"])
+            pairs.append((circle, self.rng.choice(members)))
+        return pairs
+
+    def plan_signup(self, dataset):
+        return [
+            (
+                "post",
+                "/users/signup/",
+                {
+                    "email": f"signup{i}@example.com",
+                    "username": f"signup{i}",
+                    "phone": f"+58{i:010d}",
+                    "password": "Ride-bench-2021",
+                    "password_confirmation": "Ride-bench-2021",
+                    "first_name": "Bench",
+                    "last_name": "Mark",
+                },
+                None,
+                201,
+            )
+            for i in range(dataset["requests"])
+        ]
+
+    def plan_login(self, dataset):
+        return [
+            (
+                "post",
+                "/users/login/",
+                {"email": user.email, "password": PASSWORD},
+                None,
+                201,
+            )
+            for _, user in self.sample_members(dataset)
+        ]
+
+    def plan_circles(self, dataset):
+        return [
+            ("get", "/circles/", None, dataset["tokens"][user.pk], 200)
+            for _, user in self.sample_members(dataset)
+        ]
+
+    def plan_rides(self, dataset):
+        return [
+            (
+                "get",
+                f"/circles/{circle.slug_name}/rides/",
+                None,
+                dataset["tokens"][user.pk],
+                200,
+            )
+            for circle, user in self.sample_members(dataset)
+        ]
+
+    def plan_search(self, dataset):
+        words = ("Street", "Avenue", "Apt.", "Suite", "Road", "Lane")
+        return [
+            (
+                "get",
+                f"/circles/{circle.slug_name}/rides/",
+                {"search": self.rng.choice(words)},
+                dataset["tokens"][user.pk],
+                200,
+            )
+            for circle, user in self.sample_members(dataset)
+        ]
+
+    def plan_join(self, dataset):
+        return [
+            (
+                "post",
+                f"/circles/{circle.slug_name}/rides/{ride.pk}/join/",
+                None,
+                dataset["tokens"][passenger.pk],
+                200,
+            )
+            for circle, driver, passenger, ride in dataset["writes"]["join"]
+        ]
+
+    def plan_finish(self, dataset):
+        return [
+            (
+                "post",
+                f"/circles/{circle.slug_name}/rides/{ride.pk}/finish/",
+                None,
+                dataset["tokens"][driver.pk],
+                200,
+            )
+            for circle, driver, passenger, ride in dataset["writes"]["finish"]
+        ]
+
+    def plan_rate(self, dataset):
+        return [
+            (
+                "post",
+                f"/circles/{circle.slug_name}/rides/{ride.pk}/rate/",
+                {"rating": self.rng.randint(1, 5), "comments": "Good ride"},
+                dataset["tokens"][passenger.pk],
+                201,
+            )
+            for circle, driver, passenger, ride in dataset["writes"]["rate"]
+        ]
@@ -0,0 +1,54 @@
+"""API benchmark tests"""
+
+import io
+import json
+import os
+import tempfile
+
+# Django
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+# Models
+from ride.rides.models import Ride
+from ride.users.models import User
+
+# Factories
+from ride.users.tests.factories import UserFactory
+
+
+class BenchmarkAPITestCase(TestCase):
+    """API benchmark command test case"""
+
+    def test_report(self):
+        """Every scenario succeeds and the dataset is rolled back"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.json")
+            call_command(
+                "benchmark_api",
+                circles=2,
+                members=6,
+                rides=4,
+                requests=3,
+                output=path,
+                stderr=io.StringIO(),
+            )
+            with open(path) as f:
+                report = json.load(f)
+
+        self.assertEqual(report["options"]["requests"], 3)
+        self.assertEqual(len(report["scenarios"]), 8)
+        for name, result in report["scenarios"].items():
+            self.assertEqual(result["errors"], 0, name)
+            self.assertEqual(result["requests"], 3)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+            self.assertTrue(result["queries"], name)
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Ride.objects.exists())
+
+    def test_needs_empty_database(self):
+        """Existing data would make runs not comparable"""
+        UserFactory()
+        with self.assertRaises(CommandError):
+            call_command("benchmark_api", requests=1, stdout=io.StringIO())
@@ -1,9 +1,14 @@
 import csv
-from datetime import date, datetime, timedelta
+from datetime import datetime, time, timedelta
+from itertools import chain
 
 # Django
+from django import forms
 from django.contrib import admin
-from django.http import HttpResponse
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.urls import path
 from django.utils import timezone
 
 # Model
@@ -11,6 +16,72 @@ from ride.circles.models import Circle
 from ride.rides.models import Ride
 
 
+class Echo:
+    """File-like object handing back each written line, so csv.writer
+    rows can be streamed instead of buffered
+    """
+
+    def write(self, value):
+        return value
+
+
+class ExportRidesForm(forms.Form):
+    """Date range and circles of a rides export"""
+
+    start = forms.DateField()
+    end = forms.DateField()
+    circles = forms.CharField(required=False, help_text="Comma separated slugs")
+
+    def clean(self):
+        data = super().clean()
+        if data.get("start") and data.get("end") and data["start"] > data["end"]:
+            raise forms.ValidationError("start must be before end")
+        return data
+
+
+def export_rides(circles, start, end, filename, chunk_size=2000):
+    """Stream the rides of `circles` departing in [start, end) as CSV
+    Rows are read with a server side cursor in chunks and passengers are
+    counted by the database, so memory use does not grow with the export
+    """
+    rides = (
+        Ride.objects.filter(
+            offered_in__in=circles,
+            departure_date__gte=start,
+            departure_date__lt=end,
+        )
+        .annotate(passengers_count=Count("passengers"))
+        .order_by("departure_date", "id")
+        .values_list(
+            "id",
+            "offered_in__slug_name",
+            "passengers_count",
+            "departure_location",
+            "departure_date",
+            "arrival_location",
+            "arrival_date",
+            "rating",
+        )
+    )
+    header = [
+        "id",
+        "circle",
+        "passengers",
+        "departure_location",
+        "departure_date",
+        "arrival_location",
+        "arrival_date",
+        "rating",
+    ]
+    writer = csv.writer(Echo())
+    rows = chain([header], rides.iterator(chunk_size=chunk_size))
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in rows), content_type="text/csv"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 @admin.register(Circle)
 class CircleAdmin(admin.ModelAdmin):
 
@@ -46,51 +117,65 @@ class CircleAdmin(admin.ModelAdmin):
 
     readonly_fields = ("created", "modified")
 
-    actions = ["make_verified", "make_unverified", "Download today rides"]
+    actions = ["make_verified", "make_unverified", "download_today_rides"]
 
     def make_verified(self, request, queryset):
         queryset.update(verified=True)
+        self.forget(queryset)
 
     make_verified.short_description = "Make selected circle verified"
 
     def make_unverified(self, request, queryset):
         queryset.update(verified=False)
+        self.forget(queryset)
 
     make_unverified.short_description = "Make selected circle unverified"
 
+    def forget(self, queryset):
+        """Invalidate the cached circles after a bulk update"""
+        for slug_name in queryset.values_list("slug_name", flat=True):
+            Circle.objects.forget(slug_name)
+
+    def get_urls(self):
+        urls = [
+            path(
+                "export-rides/",
+                self.admin_site.admin_view(self.export_rides_view),
+                name="circles_circle_export_rides",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def export_rides_view(self, request):
+        """Export the rides of a date range as CSV
+        e.g. export-rides/?start=2021-12-01&end=2021-12-31&circles=unam,itesm
+        Both dates are included, all circles are exported if none is given
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        form = ExportRidesForm(request.GET)
+        if not form.is_valid():
+            return HttpResponseBadRequest(form.errors.as_text())
+        data = form.cleaned_data
+
+        circles = Circle.objects.all()
+        slugs = [slug.strip() for slug in data["circles"].split(",") if slug.strip()]
+        if slugs:
+            circles = circles.filter(slug_name__in=slugs)
+        start = timezone.make_aware(datetime.combine(data["start"], time.min))
+        end = timezone.make_aware(datetime.combine(data["end"], time.min))
+        return export_rides(
+            circles.values("pk"),
+            start,
+            end + timedelta(days=1),
+            f"rides_{data['start']}_{data['end']}.csv",
+        )
+
     def download_today_rides(self, request, queryset):
         """Return today's rides"""
-        now = timezone.now()
-        start = datetime(now.year, now.month, now.day, 0, 0, 0)
-        end = start + timedelta(days=1)
-
-        rides = Ride.objects.filter(
-            offered_in__in=queryset.values_list("id"),
-            departure_date__gte=start,
-            departure_date__lte=end,
-        ).order_by("departure_date")
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="today_rides.csv"'
-        writer = csv.writer(response)
-
-        writer.writerow(
-            ["id", "passengers", "departure_location", "departure_date", "rating"]
+        start = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+        return export_rides(
+            queryset.values("pk"), start, start + timedelta(days=1), "today_rides.csv"
         )
 
-        for ride in rides:
-            writer.writerow(
-                [
-                    ride.pk,
-                    ride.passengers.count(),
-                    ride.departure_location,
-                    str(ride.departure_date),
-                    ride.arrival_location,
-                    str(ride.arrival_date),
-                    ride.rating,
-                ]
-            )
-
-        return response
-
     download_today_rides.short_description = "Download today rides"
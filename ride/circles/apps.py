@@ -5,3 +5,6 @@ class CirclesAppConfig(AppConfig):
 
     name = "ride.circles"
     verbose_name = "Circles"
+
+    def ready(self):
+        from ride.circles import signals  # noqa F401
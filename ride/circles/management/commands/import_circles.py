@@ -0,0 +1,166 @@
+"""Import circles"""
+
+import csv
+from itertools import islice
+
+# Django
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+# Models
+from ride.circles.models import Circle
+
+BOOLEANS = {"1": True, "true": True, "0": False, "false": False, "": False}
+
+
+class Command(BaseCommand):
+    """Create or update circles from a CSV file
+    The file is read in batches. Every batch is validated, existing
+    circles are looked up by slug with one query, then updated with
+    bulk_update in statements of a few hundred rows and the new ones
+    inserted with bulk_create, all inside one transaction per batch.
+    Invalid rows are reported and skipped.
+
+    Expected columns: name, slug_name, is_public, verified, members_limit
+    and optionally about. A members_limit greater than 0 makes the circle
+    limited.
+    """
+
+    help = "Import circles from a CSV file"
+
+    update_fields = [
+        "name",
+        "is_public",
+        "verified",
+        "is_limited",
+        "members_limit",
+        "modified",
+    ]
+
+    # Rows per UPDATE statement
+    update_batch_size = 500
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="CSV file with a header row")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows validated and written per transaction",
+        )
+
+    def handle(self, *args, **options):
+        created = updated = errors = 0
+        try:
+            csv_file = open(options["file"], newline="", encoding="utf-8")
+        except OSError as e:
+            raise CommandError(e)
+
+        with csv_file:
+            reader = csv.DictReader(csv_file)
+            missing = {"name", "slug_name"} - set(reader.fieldnames or [])
+            if missing:
+                raise CommandError(f"Missing columns: {', '.join(sorted(missing))}")
+            fields = list(self.update_fields)
+            if "about" in reader.fieldnames:
+                fields.append("about")
+
+            numbered = self.numbered(reader)
+            while True:
+                rows = list(islice(numbered, options["batch_size"]))
+                if not rows:
+                    break
+                circles = {}
+                for line, row in rows:
+                    try:
+                        circle = self.build(row)
+                    except ValidationError as e:
+                        errors += 1
+                        self.stderr.write(f"Line {line}: {'; '.join(e.messages)}")
+                        continue
+                    circles[circle.slug_name] = circle
+                batch_created, batch_updated = self.save(circles, fields)
+                created += batch_created
+                updated += batch_updated
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} circles, updated {updated}, {errors} errors"
+            )
+        )
+
+    def numbered(self, reader):
+        """Yield the rows of `reader` along with the line they start on,
+        quoted values may span several lines
+        """
+        line = reader.line_num + 1
+        for row in reader:
+            yield line, row
+            line = reader.line_num + 1
+
+    def build(self, row):
+        """Return an unsaved circle from a CSV row, raise ValidationError
+        if the row is invalid
+        """
+        values = {
+            "name": (row.get("name") or "").strip(),
+            "slug_name": (row.get("slug_name") or "").strip(),
+            "about": (row.get("about") or "").strip(),
+        }
+        for field in ("is_public", "verified"):
+            value = (row.get(field) or "").strip().lower()
+            if value not in BOOLEANS:
+                raise ValidationError(f"{field}: '{value}' is not a boolean")
+            values[field] = BOOLEANS[value]
+        try:
+            values["members_limit"] = int(row.get("members_limit") or 0)
+        except ValueError:
+            raise ValidationError("members_limit: must be an integer")
+        values["is_limited"] = values["members_limit"] > 0
+
+        messages = []
+        for name in ("name", "slug_name", "about", "members_limit"):
+            if name == "about" and not values[name]:
+                continue
+            try:
+                Circle._meta.get_field(name).clean(values[name], None)
+            except ValidationError as e:
+                messages += [f"{name}: {message}" for message in e.messages]
+        if messages:
+            raise ValidationError(messages)
+        return Circle(**values)
+
+    def save(self, circles, fields):
+        """Upsert a batch of circles by slug, updating `fields`
+        Return the number of circles created and updated
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            existing = dict(
+                Circle.objects.filter(slug_name__in=circles).values_list(
+                    "slug_name", "pk"
+                )
+            )
+            updates = []
+            for slug_name, pk in existing.items():
+                circle = circles.pop(slug_name)
+                circle.pk = pk
+                circle.modified = now
+                updates.append(circle)
+            # One CASE per field and row, keep every statement small
+            Circle.objects.bulk_update(
+                updates, fields, batch_size=self.update_batch_size
+            )
+            # Circles created meanwhile by someone else are left untouched
+            # and not counted as created
+            new = Circle.objects.filter(slug_name__in=circles)
+            before = new.count()
+            Circle.objects.bulk_create(circles.values(), ignore_conflicts=True)
+            created = new.count() - before
+
+        # Bulk writes send no signals
+        for slug_name in existing:
+            Circle.objects.forget(slug_name)
+        return created, len(updates)
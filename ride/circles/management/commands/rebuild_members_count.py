@@ -0,0 +1,30 @@
+"""Rebuild circle members counts"""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# Models
+from ride.circles.models import Circle, Membership
+
+
+class Command(BaseCommand):
+    """Recompute the members count of every circle from its active
+    memberships, repairing any drift in the maintained counter
+    """
+
+    help = "Rebuild the members count of every circle"
+
+    def handle(self, *args, **options):
+        members = (
+            Membership.objects.filter(circle=OuterRef("pk"), is_active=True)
+            .order_by()
+            .values("circle")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        circles = Circle.objects.update(members_count=Coalesce(Subquery(members), 0))
+        for slug_name in Circle.objects.values_list("slug_name", flat=True).iterator():
+            Circle.objects.forget(slug_name)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {circles} circles"))
@@ -1 +1,3 @@
+from .circles import *
 from .invitations import *
+from .memberships import *
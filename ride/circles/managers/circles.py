@@ -0,0 +1,43 @@
+# Django
+from django.db import models
+from django.db.models import F, Q
+
+# Utilities
+from ride.utils.cache import TieredCache
+
+circles_cache = TieredCache("circles")
+
+
+class CircleManager(models.Manager):
+    """Circle manager
+    Used to resolve circles by slug name through the cache
+    """
+
+    def get_by_slug(self, slug_name):
+        """Return the circle with the given slug name, or None"""
+        return circles_cache.get_or_set(
+            slug_name, lambda: self.filter(slug_name=slug_name).first()
+        )
+
+    def forget(self, slug_name):
+        """Invalidate the cached circle with the given slug name"""
+        circles_cache.delete(slug_name)
+
+    def count_members(self, circle_id, by=1):
+        """Add `by` to the active members count of a circle"""
+        self.filter(pk=circle_id).update(members_count=F("members_count") + by)
+
+    def admit_member(self, circle_id):
+        """Count a new active member unless the circle is full
+        The check and the increment are a single conditional UPDATE, which
+        holds the circle row lock until the transaction ends, so concurrent
+        joins can never go over the members limit.
+        Return whether the member was admitted
+        """
+        full = Q(is_limited=True, members_count__gte=F("members_limit"))
+        admitted = (
+            self.filter(pk=circle_id)
+            .exclude(full)
+            .update(members_count=F("members_count") + 1)
+        )
+        return admitted == 1
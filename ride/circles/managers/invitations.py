@@ -1,9 +1,10 @@
 # Utilities
-import random
+import secrets
 from string import ascii_uppercase, digits
 
 # Django
 from django.db import models
+from django.utils import timezone
 
 
 class InvitationManager(models.Manager):
@@ -12,11 +13,39 @@ class InvitationManager(models.Manager):
     """
 
     CODE_LENGTH = 10
+    CODE_POOL = ascii_uppercase + digits + ".-"
+
+    def generate_code(self):
+        """Return a random invitation code"""
+        return "".join(secrets.choice(self.CODE_POOL) for _ in range(self.CODE_LENGTH))
 
     def create(self, **kwargs):
-        pool = ascii_uppercase + digits + ".-"
-        code = kwargs.get("code", "".join(random.choices(pool, k=self.CODE_LENGTH)))
+        code = kwargs.get("code", self.generate_code())
         while self.filter(code=code).exists():
-            code = "".join(random.choices(pool, k=self.CODE_LENGTH))
+            code = self.generate_code()
         kwargs["code"] = code
         return super(InvitationManager, self).create(**kwargs)
+
+    def bulk_create_codes(self, circle, issuer, n):
+        """Create `n` invitations issued by `issuer` for `circle`
+        Codes are inserted with a single statement skipping the ones
+        already taken, and only those are generated again.
+        Return the new codes
+        """
+        codes = []
+        while len(codes) < n:
+            started = timezone.now()
+            batch = set()
+            while len(batch) < n - len(codes):
+                batch.add(self.generate_code())
+            self.bulk_create(
+                [
+                    self.model(code=code, circle=circle, issued_by=issuer)
+                    for code in batch
+                ],
+                ignore_conflicts=True,
+            )
+            codes += self.filter(
+                code__in=batch, circle=circle, issued_by=issuer, created__gte=started
+            ).values_list("code", flat=True)
+        return codes
@@ -0,0 +1,49 @@
+# Django
+from django.db import models
+
+# Utilities
+from ride.utils.cache import TieredCache
+
+memberships_cache = TieredCache("memberships")
+
+
+class MembershipManager(models.Manager):
+    """Membership manager
+    Used to resolve active memberships through the cache
+    """
+
+    def get_active(self, user, circle):
+        """Return the active membership of the user in the circle, or None"""
+        if not user.is_authenticated:
+            return None
+        return memberships_cache.get_or_set(
+            f"{user.pk}:{circle.pk}", lambda: self.find_active(user, circle)
+        )
+
+    def find_active(self, user, circle):
+        """Read the active membership from the database
+        There is at most one, so it is not ordered and the lookup stays
+        on the user and circle index
+        """
+        memberships = self.filter(user=user, circle=circle, is_active=True)
+        memberships = memberships.order_by()[:1]
+        return memberships[0] if memberships else None
+
+    def forget(self, user_id, circle_id):
+        """Invalidate the cached membership of the user in the circle"""
+        memberships_cache.delete(f"{user_id}:{circle_id}")
+
+    def deactivate(self, membership):
+        """Deactivate a membership and discount it from its circle
+        Return False if it was not active anymore
+        """
+        deactivated = self.filter(pk=membership.pk, is_active=True).update(
+            is_active=False
+        )
+        membership.is_active = False
+        membership.counted = False
+        self.forget(membership.user_id, membership.circle_id)
+        if deactivated:
+            circles = self.model._meta.get_field("circle").related_model.objects
+            circles.count_members(membership.circle_id, -1)
+        return bool(deactivated)
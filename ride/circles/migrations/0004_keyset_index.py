@@ -0,0 +1,19 @@
+# Generated by Django 3.1.13 on 2026-10-18 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("circles", "0003_invitation"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="membership",
+            index=models.Index(
+                fields=["circle", "created", "id"], name="membership_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.1.13 on 2026-10-18 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("circles", "0004_keyset_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="invitation",
+            index=models.Index(
+                fields=["circle", "issued_by", "used"], name="invitation_issuer_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="membership",
+            index=models.Index(
+                fields=["user", "circle", "is_active"],
+                name="membership_user_circle_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.1.13 on 2026-10-18 03:15
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_members(apps, schema_editor):
+    """Count the active members of existing circles"""
+    Circle = apps.get_model("circles", "Circle")
+    Membership = apps.get_model("circles", "Membership")
+    members = (
+        Membership.objects.filter(circle=OuterRef("pk"), is_active=True)
+        .order_by()
+        .values("circle")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Circle.objects.update(members_count=Coalesce(Subquery(members), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("circles", "0005_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="circle",
+            name="members_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of active members"
+            ),
+        ),
+        migrations.RunPython(count_members, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="circle",
+            index=models.Index(
+                condition=models.Q(is_public=True),
+                fields=["-members_count", "-rides_offered", "-rides_taken"],
+                name="circle_public_listing_idx",
+            ),
+        ),
+    ]
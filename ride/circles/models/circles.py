@@ -2,6 +2,9 @@ from django.db import models
 
 from ride.utils.models import RideModel
 
+# Managers
+from ride.circles.managers import CircleManager
+
 
 class Circle(RideModel):
     """Circle model
@@ -19,6 +22,9 @@ class Circle(RideModel):
 
     rides_taken = models.PositiveIntegerField(default=0)
     rides_offered = models.PositiveIntegerField(default=0)
+    members_count = models.PositiveIntegerField(
+        default=0, help_text="Number of active members"
+    )
 
     verified = models.BooleanField(
         "verified circle",
@@ -47,8 +53,19 @@ class Circle(RideModel):
         "users.User", through="circles.Membership", through_fields=("circle", "user")
     )
 
+    # Manager
+    objects = CircleManager()
+
     def __str__(self):
         return self.name
 
     class Meta(RideModel.Meta):
         ordering = ["-rides_taken", "-rides_offered"]
+        indexes = [
+            # Default ordering of the public circles listing
+            models.Index(
+                fields=["-members_count", "-rides_offered", "-rides_taken"],
+                name="circle_public_listing_idx",
+                condition=models.Q(is_public=True),
+            ),
+        ]
@@ -48,3 +48,11 @@ class Invitation(RideModel):
     def __str__(self):
         """Return code and circle"""
         return f"#{self.circle.slug_name}: {self.code}"
+
+    class Meta(RideModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["circle", "issued_by", "used"],
+                name="invitation_issuer_idx",
+            ),
+        ]
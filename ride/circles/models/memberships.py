@@ -4,6 +4,9 @@ from django.db import models
 # Utilities
 from ride.utils.models import RideModel
 
+# Managers
+from ride.circles.managers import MembershipManager
+
 
 class Membership(RideModel):
     """Membership model
@@ -40,5 +43,31 @@ class Membership(RideModel):
         help_text="Only active users are allowed to interact in the circle",
     )
 
+    # Manager
+    objects = MembershipManager()
+
+    # Whether the circle's members count includes this membership,
+    # kept by the membership signals
+    counted = False
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember whether the loaded membership is counted"""
+        membership = super().from_db(db, field_names, values)
+        membership.counted = membership.__dict__.get("is_active", False)
+        return membership
+
     def __str__(self):
         return f"@{self.user.username} at {self.circle.slug_name}"
+
+    class Meta(RideModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["circle", "created", "id"],
+                name="membership_created_idx",
+            ),
+            models.Index(
+                fields=["user", "circle", "is_active"],
+                name="membership_user_circle_idx",
+            ),
+        ]
@@ -10,10 +10,5 @@ class IsCircleAdmin(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         """Verify user have a membership in the obj"""
-        try:
-            Membership.objects.get(
-                user=request.user, circle=obj, is_admin=True, is_active=True
-            )
-        except Membership.DoesNotExist:
-            return False
-        return True
+        membership = Membership.objects.get_active(request.user, obj)
+        return membership is not None and membership.is_admin
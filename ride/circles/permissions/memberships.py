@@ -1,25 +1,16 @@
 # Django REST framework
 from rest_framework.permissions import BasePermission
 
-# Models
-from ride.circles.models import Membership, memberships
-
 
 class IsActiveCircleMember(BasePermission):
     """Allow access only to circle members
     Expect that the views implementing this permission
-    have a 'circle' attribute assigned
+    have a 'get_membership' method, see CircleNestedMixin
     """
 
     def has_permission(self, request, view):
         """Verify that user is an active member"""
-        try:
-            Membership.objects.get(
-                user=request.user, circle=view.circle, is_active=True
-            )
-        except Membership.DoesNotExist:
-            return False
-        return True
+        return view.get_membership() is not None
 
 
 class IsAdminOrMembershipOwner(BasePermission):
@@ -29,21 +20,18 @@ class IsAdminOrMembershipOwner(BasePermission):
         membership = view.get_object()
         if membership.user == request.user:
             return True
-        try:
-            Membership.objects.get(
-                circle=view.circle, user=request.user, is_active=True, is_admin=True
-            )
-        except Membership.DoesNotExist:
-            return False
-        return True
+        admin = view.get_membership()
+        return admin is not None and admin.is_admin
 
 
 class IsSelfMember(BasePermission):
-    """Allow access only to member owners"""
+    """Allow access only to member owners
+    Members are looked up by username, so the one in the URL must be
+    the requesting user's
+    """
 
     def has_permission(self, request, view):
-        obj = view.get_object()
-        return super().has_object_permission(request, view, obj)
+        return view.kwargs.get("pk") == request.user.username
 
     def has_object_permission(self, request, view, obj):
         return request.user == obj.user
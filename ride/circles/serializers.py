@@ -1,4 +1,5 @@
 # Django
+from django.db import transaction
 from django.utils import timezone
 
 # Django rest-framework
@@ -10,6 +11,7 @@ from ride.circles.models import Circle, Membership, Invitation
 
 # Serializer
 from ride.users.serializers import UserModelSerializer
+from ride.utils.serializers import CompiledSerializer
 
 
 class CircleSerializer(serializers.Serializer):
@@ -49,6 +51,7 @@ class CircleModelSerializer(serializers.ModelSerializer):
             "about",
             "rides_offered",
             "rides_taken",
+            "members_count",
             "verified",
             "is_public",
             "is_limited",
@@ -59,6 +62,7 @@ class CircleModelSerializer(serializers.ModelSerializer):
             "verified",
             "rides_offered",
             "rides_taken",
+            "members_count",
         )
 
     def validate(self, data):
@@ -100,6 +104,15 @@ class MembershipSerializer(serializers.ModelSerializer):
         )
 
 
+class CompiledMembershipSerializer(CompiledSerializer):
+    """Member listing serializer
+    Same output as MembershipSerializer, built from .values() rows
+    """
+
+    serializer_class = MembershipSerializer
+    related_strings = {"invited_by": "invited_by__username"}
+
+
 class AddMemberSerializer(serializers.Serializer):
     """Add member serializer
 
@@ -128,13 +141,6 @@ class AddMemberSerializer(serializers.Serializer):
             raise serializers.ValidationError("Invalid invitation code")
         self.context["invitation"] = invitation
 
-    def validate(self, data):
-        """validate members limit in circle"""
-        circle = self.context["circle"]
-        if circle.is_limited and circle.members.count() >= circle.members_limit:
-            raise serializers.ValidationError("Circle has reached its members limit")
-        return data
-
     def create(self, data):
         """Create new circle member"""
         circle = self.context["circle"]
@@ -144,13 +150,22 @@ class AddMemberSerializer(serializers.Serializer):
         else:
             user = data["user"]
         now = timezone.now()
-        # Member creation
-        member = Membership.objects.create(
-            user=user,
-            profile=user.profile,
-            circle=circle,
-            invited_by=invitation.issued_by,
-        )
+        with transaction.atomic():
+            # Members limit, checked and counted atomically
+            if not Circle.objects.admit_member(circle.pk):
+                raise serializers.ValidationError(
+                    "Circle has reached its members limit"
+                )
+
+            # Member creation, already counted on admission
+            member = Membership(
+                user=user,
+                profile=user.profile,
+                circle=circle,
+                invited_by=invitation.issued_by,
+            )
+            member.counted = True
+            member.save()
 
         # Update invitation
         invitation.used_by = user
@@ -0,0 +1,52 @@
+"""Circles signals"""
+
+# Django
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# Models
+from ride.circles.models import Circle, Membership
+
+
+@receiver(pre_save, sender=Circle)
+def forget_renamed_circle(sender, instance, **kwargs):
+    """Invalidate the cached circle under its previous slug name"""
+    if instance.pk is None:
+        return
+    previous = (
+        Circle.objects.filter(pk=instance.pk)
+        .values_list("slug_name", flat=True)
+        .first()
+    )
+    if previous and previous != instance.slug_name:
+        Circle.objects.forget(previous)
+
+
+@receiver(post_save, sender=Circle)
+@receiver(post_delete, sender=Circle)
+def forget_circle(sender, instance, **kwargs):
+    """Invalidate the cached circle when it changes"""
+    Circle.objects.forget(instance.slug_name)
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def forget_membership(sender, instance, **kwargs):
+    """Invalidate the cached membership when it changes"""
+    Membership.objects.forget(instance.user_id, instance.circle_id)
+
+
+@receiver(post_save, sender=Membership)
+def count_member(sender, instance, **kwargs):
+    """Count the membership in its circle while it is active"""
+    if instance.is_active != instance.counted:
+        by = 1 if instance.is_active else -1
+        Circle.objects.count_members(instance.circle_id, by)
+        instance.counted = instance.is_active
+
+
+@receiver(post_delete, sender=Membership)
+def discount_member(sender, instance, **kwargs):
+    """Discount the deleted membership from its circle"""
+    if instance.counted:
+        Circle.objects.count_members(instance.circle_id, -1)
@@ -0,0 +1,45 @@
+"""Circle factories"""
+
+# Factory boy
+import factory
+from factory.django import DjangoModelFactory
+
+# Models
+from ride.circles.models import Circle, Membership, Invitation
+
+# Factories
+from ride.users.tests.factories import UserFactory
+
+
+class CircleFactory(DjangoModelFactory):
+    """Public circle"""
+
+    name = factory.Faker("company")
+    slug_name = factory.Sequence(lambda n: f"circle-{n}")
+    about = factory.Faker("catch_phrase")
+    is_public = True
+
+    class Meta:
+        model = Circle
+
+
+class MembershipFactory(DjangoModelFactory):
+    """Active membership, counted in the circle's members"""
+
+    user = factory.SubFactory(UserFactory)
+    profile = factory.LazyAttribute(lambda membership: membership.user.profile)
+    circle = factory.SubFactory(CircleFactory)
+
+    class Meta:
+        model = Membership
+
+
+class InvitationFactory(DjangoModelFactory):
+    """Unused invitation issued by a member"""
+
+    code = factory.LazyFunction(Invitation.objects.generate_code)
+    issued_by = factory.SubFactory(UserFactory)
+    circle = factory.SubFactory(CircleFactory)
+
+    class Meta:
+        model = Invitation
@@ -0,0 +1,82 @@
+"""Circles admin tests"""
+
+import csv
+import io
+from datetime import timedelta
+
+# Django
+from django.test import TestCase
+from django.utils import timezone
+
+# Models
+from ride.circles.models import Circle
+from ride.rides.models import Ride
+from ride.users.models import User
+
+
+class ExportRidesTestCase(TestCase):
+    """Rides CSV export test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@pepe.co", password="admin123"
+        )
+        self.client.force_login(self.admin)
+        self.circles = [
+            Circle.objects.create(name=slug, slug_name=slug, about="circle")
+            for slug in ("unam", "itesm")
+        ]
+        self.today = timezone.localtime().replace(hour=12, minute=0)
+        for circle in self.circles:
+            for days in (0, 0, 3):
+                ride = Ride.objects.create(
+                    offered_by=self.admin,
+                    offered_in=circle,
+                    departure_location="calle 140",
+                    departure_date=self.today + timedelta(days=days),
+                    arrival_location="calle 170",
+                    arrival_date=self.today + timedelta(days=days, hours=1),
+                )
+                ride.passengers.add(self.admin)
+
+    def read(self, response):
+        """Return the rows of a streamed CSV response"""
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_download_today_rides(self):
+        """The admin action exports today's rides of the selected circles"""
+        response = self.client.post(
+            "/admin/circles/circle/",
+            {
+                "action": "download_today_rides",
+                "_selected_action": [self.circles[0].pk],
+            },
+        )
+        rows = self.read(response)
+        self.assertEqual(rows[0][:3], ["id", "circle", "passengers"])
+        self.assertEqual(len(rows), 3)
+        for row in rows[1:]:
+            self.assertEqual(len(row), len(rows[0]))
+            self.assertEqual(row[1:3], ["unam", "1"])
+
+    def test_export_date_range(self):
+        """Any date range can be exported in a single query"""
+        start = self.today.date()
+        end = start + timedelta(days=3)
+        response = self.client.get(
+            "/admin/circles/circle/export-rides/",
+            {"start": start, "end": end, "circles": "unam,itesm"},
+        )
+        with self.assertNumQueries(1):
+            rows = self.read(response)
+        self.assertEqual(len(rows), 7)
+
+    def test_export_invalid_range(self):
+        """Dates are validated"""
+        response = self.client.get(
+            "/admin/circles/circle/export-rides/",
+            {"start": "2021-12-31", "end": "2021"},
+        )
+        self.assertEqual(response.status_code, 400)
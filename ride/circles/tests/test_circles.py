@@ -0,0 +1,138 @@
+"""Circles tests"""
+
+from io import StringIO
+
+# Django
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+
+# Models
+from ride.circles.models import Circle, Membership
+
+# Managers
+from ride.circles.managers.circles import circles_cache
+
+# Factories
+from ride.circles.tests.factories import CircleFactory, MembershipFactory
+from ride.users.tests.factories import UserFactory
+
+
+class CircleResolverTestCase(TestCase):
+    """Cached circle resolution test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.circle = Circle.objects.create(
+            name="College",
+            slug_name="college",
+            about="Official circle for college",
+        )
+
+    def test_circle_is_cached(self):
+        """Resolving the same slug twice hits the database once"""
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                circle = Circle.objects.get_by_slug("college")
+        self.assertEqual(circle, self.circle)
+
+    def test_unknown_slug(self):
+        """Unknown slugs resolve to None"""
+        self.assertIsNone(Circle.objects.get_by_slug("nope"))
+
+    def test_rename_invalidates_cache(self):
+        """A renamed circle is no longer found under its old slug"""
+        Circle.objects.get_by_slug("college")
+        self.circle.slug_name = "university"
+        self.circle.save()
+        self.assertIsNone(Circle.objects.get_by_slug("college"))
+        self.assertEqual(Circle.objects.get_by_slug("university"), self.circle)
+
+
+class CircleCommitTestCase(TransactionTestCase):
+    """Circle cache invalidation on commit test case"""
+
+    def test_commit_forgets_stale_circle(self):
+        """Circles cached by a concurrent request before a rename or a
+        limit change commits are forgotten once it does
+        """
+        circle = CircleFactory(slug_name="college")
+        stale = Circle.objects.get(pk=circle.pk)
+        with transaction.atomic():
+            circle.slug_name = "university"
+            circle.is_limited = True
+            circle.members_limit = 10
+            circle.save()
+            # Other requests read the circle before the commit
+            circles_cache.get_or_set("college", lambda: stale)
+            circles_cache.get_or_set("university", lambda: stale)
+        self.assertIsNone(Circle.objects.get_by_slug("college"))
+        self.assertTrue(Circle.objects.get_by_slug("university").is_limited)
+
+
+class CircleMembersCountAPITestCase(APITestCase):
+    """Circle members count test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.circles = [CircleFactory(slug_name=slug) for slug in ("small", "big")]
+        self.users = UserFactory.create_batch(3)
+        for user in self.users:
+            MembershipFactory(user=user, circle=self.circles[1])
+        MembershipFactory(user=self.users[0], circle=self.circles[0])
+
+        # Auth
+        self.token = Token.objects.create(user=self.users[0]).key
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+    def test_listing_order(self):
+        """Circles are listed by members count without counting them"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/circles/")
+        self.assertEqual(
+            [circle["slug_name"] for circle in response.data["results"]],
+            ["big", "small"],
+        )
+        self.assertEqual(response.data["results"][0]["members_count"], 3)
+        for query in context.captured_queries:
+            self.assertNotIn("GROUP BY", query["sql"])
+
+    def test_leaving_is_counted_once(self):
+        """Deactivating a membership twice discounts it once"""
+        membership = Membership.objects.get(user=self.users[1], circle=self.circles[1])
+        self.assertTrue(Membership.objects.deactivate(membership))
+        self.assertFalse(Membership.objects.deactivate(membership))
+        self.circles[1].refresh_from_db()
+        self.assertEqual(self.circles[1].members_count, 2)
+
+    def test_membership_writes_are_counted(self):
+        """Saving and deleting memberships keeps the members count"""
+        circle = self.circles[0]
+        membership = Membership.objects.get(user=self.users[0], circle=circle)
+        membership.is_active = False
+        membership.save()
+        membership.save()
+        circle.refresh_from_db()
+        self.assertEqual(circle.members_count, 0)
+
+        membership.is_active = True
+        membership.save()
+        circle.refresh_from_db()
+        self.assertEqual(circle.members_count, 1)
+
+        Membership.objects.get(pk=membership.pk).delete()
+        circle.refresh_from_db()
+        self.assertEqual(circle.members_count, 0)
+
+    def test_rebuild_members_count(self):
+        """The rebuild command recomputes counts from active memberships"""
+        Circle.objects.update(members_count=42)
+        Membership.objects.filter(user=self.users[2]).update(is_active=False)
+        call_command("rebuild_members_count", stdout=StringIO())
+        counts = dict(Circle.objects.values_list("slug_name", "members_count"))
+        self.assertEqual(counts, {"small": 1, "big": 2})
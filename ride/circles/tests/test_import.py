@@ -0,0 +1,88 @@
+"""Circles import tests"""
+
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+# Django
+from django.core.management import call_command
+from django.test import TestCase
+
+# Models
+from ride.circles.models import Circle
+
+
+class ImportCirclesTestCase(TestCase):
+    """Bulk circles import test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        Circle.objects.create(
+            name="Old name",
+            slug_name="platzi-bog",
+            about="Kept description",
+        )
+
+    def import_circles(self, content, **options):
+        """Import `content` as a CSV file, return stdout and stderr"""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write(content)
+        self.addCleanup(os.remove, f.name)
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_circles", f.name, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import(self):
+        """Circles are created or updated by slug, bad rows are reported"""
+        stdout, stderr = self.import_circles(
+            "name,slug_name,is_public,verified,members_limit\n"
+            '"Facultad de Ciencias, UNAM",unam-fciencias,1,1,0\n'
+            "Platzi Bogotá,platzi-bog,0,1,120\n"
+            "Broken,not a slug,1,1,0\n"
+            "Inventive,inventive,0,maybe,30\n"
+            "Inventive,inventive,0,1,30\n"
+            '"Poets\nand writers",poets,1,1,0\n'
+            "Unnamed,,1,1,0\n",
+            batch_size=2,
+        )
+        self.assertIn("Created 3 circles, updated 1, 3 errors", stdout)
+        self.assertIn("Line 4: slug_name", stderr)
+        self.assertIn("Line 5: verified", stderr)
+        self.assertIn("Line 9: slug_name", stderr)
+
+        circle = Circle.objects.get(slug_name="unam-fciencias")
+        self.assertTrue(circle.is_public)
+        self.assertFalse(circle.is_limited)
+
+        circle = Circle.objects.get(slug_name="platzi-bog")
+        self.assertEqual(circle.name, "Platzi Bogotá")
+        self.assertEqual(circle.about, "Kept description")
+        self.assertEqual(
+            Circle.objects.get(slug_name="poets").name, "Poets\nand writers"
+        )
+        self.assertTrue(circle.is_limited)
+        self.assertEqual(circle.members_limit, 120)
+
+        self.assertEqual(Circle.objects.get(slug_name="inventive").members_limit, 30)
+
+    def test_conflicts_are_not_created(self):
+        """Circles inserted by someone else during the import are left
+        untouched and not reported as created
+        """
+        bulk_update = Circle.objects.bulk_update
+
+        def concurrent_insert(*args, **kwargs):
+            Circle.objects.create(name="Taken", slug_name="poets")
+            return bulk_update(*args, **kwargs)
+
+        with mock.patch.object(
+            Circle.objects, "bulk_update", side_effect=concurrent_insert
+        ):
+            stdout, _ = self.import_circles(
+                "name,slug_name,is_public,verified,members_limit\n"
+                "Poets,poets,1,1,0\n"
+                "Inventive,inventive,0,1,30\n"
+            )
+        self.assertIn("Created 1 circles, updated 0, 0 errors", stdout)
+        self.assertEqual(Circle.objects.get(slug_name="poets").name, "Taken")
@@ -1,5 +1,7 @@
 """Invitations tests"""
 
+from unittest import mock
+
 # Django
 from django.test import TestCase
 
@@ -12,6 +14,9 @@ from rest_framework.authtoken.models import Token
 from ride.circles.models import Invitation, Circle, Membership
 from ride.users.models import User, Profile
 
+# Factories
+from ride.circles.tests.factories import MembershipFactory
+
 
 class InvitationsManagerTestCase(TestCase):
     """Invitations manager test case"""
@@ -56,6 +61,25 @@ class InvitationsManagerTestCase(TestCase):
         )
         self.assertNotEqual(invitation_a.code, invitation_b.code)
 
+    def test_bulk_code_generation(self):
+        """Codes can be generated in bulk"""
+        codes = Invitation.objects.bulk_create_codes(self.circle, self.user, 10)
+        self.assertEqual(len(set(codes)), 10)
+        self.assertEqual(
+            Invitation.objects.filter(code__in=codes, issued_by=self.user).count(), 10
+        )
+
+    def test_bulk_code_generation_if_duplicated(self):
+        """Only the codes already taken must be generated again"""
+        Invitation.objects.create(issued_by=self.user, circle=self.circle, code="TAKEN")
+        generated = iter(["TAKEN", "FRESH1", "FRESH2"])
+        with mock.patch.object(
+            Invitation.objects, "generate_code", lambda: next(generated)
+        ):
+            codes = Invitation.objects.bulk_create_codes(self.circle, self.user, 2)
+        self.assertEqual(sorted(codes), ["FRESH1", "FRESH2"])
+        self.assertEqual(Invitation.objects.count(), 3)
+
 
 class MemberInvitationsAPITestCase(APITestCase):
     """Member invitations manager test case"""
@@ -111,3 +135,20 @@ class MemberInvitationsAPITestCase(APITestCase):
         self.assertEqual(invitations.count(), self.membership.remaining_invitations)
         for invitation in invitations:
             self.assertIn(invitation.code, request.data["invitations"])
+
+    def test_topped_up_quota(self):
+        """A quota raised after the membership was cached is honored"""
+        self.client.get(self.url)
+        Membership.objects.filter(pk=self.membership.pk).update(
+            remaining_invitations=15
+        )
+        request = self.client.get(self.url)
+        self.assertEqual(len(request.data["invitations"]), 15)
+
+    def test_other_member_is_forbidden(self):
+        """Members cannot open another member's invitations"""
+        other = MembershipFactory(circle=self.circle).user
+        request = self.client.get(
+            f"/circles/{self.circle.slug_name}/members/{other.username}/invitations/"
+        )
+        self.assertEqual(request.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,108 @@
+"""Memberships tests"""
+
+# Django
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+
+# Models
+from ride.circles.models import Membership, Invitation
+
+# Managers
+from ride.circles.managers.memberships import memberships_cache
+
+# Factories
+from ride.circles.tests.factories import CircleFactory, MembershipFactory
+from ride.users.tests.factories import UserFactory
+
+
+class MembershipResolverTestCase(TestCase):
+    """Cached membership resolution test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.user = UserFactory()
+        self.circle = CircleFactory()
+
+    def test_membership_is_cached(self):
+        """Resolving the same membership twice hits the database once"""
+        membership = MembershipFactory(user=self.user, circle=self.circle)
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                resolved = Membership.objects.get_active(self.user, self.circle)
+        self.assertEqual(resolved, membership)
+
+    def test_membership_changes_invalidate_cache(self):
+        """Joining and leaving a circle are seen right away"""
+        self.assertIsNone(Membership.objects.get_active(self.user, self.circle))
+
+        membership = MembershipFactory(user=self.user, circle=self.circle)
+        self.assertEqual(
+            Membership.objects.get_active(self.user, self.circle), membership
+        )
+
+        membership.is_active = False
+        membership.save()
+        self.assertIsNone(Membership.objects.get_active(self.user, self.circle))
+
+
+class MembershipCommitTestCase(TransactionTestCase):
+    """Membership cache invalidation on commit test case"""
+
+    def test_commit_forgets_stale_membership(self):
+        """A membership cached by a concurrent request before the commit
+        is forgotten once the deactivation commits
+        """
+        membership = MembershipFactory()
+        user, circle = membership.user, membership.circle
+        with transaction.atomic():
+            Membership.objects.deactivate(membership)
+            # Another request reads the row before the commit
+            memberships_cache.get_or_set(f"{user.pk}:{circle.pk}", lambda: membership)
+        self.assertIsNone(Membership.objects.get_active(user, circle))
+
+
+class MembersLimitAPITestCase(APITestCase):
+    """Limited circles admission test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.circle = CircleFactory(is_limited=True, members_limit=2)
+        self.admin = MembershipFactory(
+            circle=self.circle, is_admin=True, remaining_invitations=10
+        ).user
+
+        # URL
+        self.url = f"/circles/{self.circle.slug_name}/members/"
+
+    def join(self, username):
+        """Join the circle as a new user with a fresh invitation"""
+        user = UserFactory(username=username)
+        code = Invitation.objects.bulk_create_codes(self.circle, self.admin, 1)[0]
+        token = Token.objects.create(user=user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        return self.client.post(self.url, {"invitation_code": code})
+
+    def test_members_limit(self):
+        """A full circle rejects new members and keeps its count"""
+        response = self.join("pepito")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.join("juanito")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Membership.objects.filter(user__username="juanito").exists())
+
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.members_count, 2)
+
+    def test_leaving_frees_a_place(self):
+        """Deactivated members do not count towards the limit"""
+        self.join("pepito")
+        membership = Membership.objects.get(user__username="pepito")
+        Membership.objects.deactivate(membership)
+        response = self.join("juanito")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
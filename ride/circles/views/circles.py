@@ -18,8 +18,11 @@ from ride.circles.serializers import CircleModelSerializer
 from ride.circles.models import Circle, circles
 from ride.circles.models.memberships import Membership
 
+# Utilities
+from ride.utils.views import SerializerTimingMixin
 
-class CircleViewSet(viewsets.ModelViewSet):
+
+class CircleViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """Circle view set"""
 
     serializer_class = CircleModelSerializer
@@ -30,13 +33,14 @@ class CircleViewSet(viewsets.ModelViewSet):
     search_fields = ("slug_name", "name")
     filter_fields = ("verified", "is_limited")
     ordering_fields = (
+        "members_count",
         "rides_offered",
         "rides_taken",
         "name",
         "creater",
         "members_limit",
     )
-    ordering = ("-members__count", "-rides_offered", "-rides_taken")
+    ordering = ("-members_count", "-rides_offered", "-rides_taken")
 
     # {{host}}/circles/?verified=1&limit=10&ordering=name&search=UNAM&is_limited=false
 
@@ -6,10 +6,22 @@ from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 
 # Models
-from ride.circles.models import Circle, Membership, Invitation
+from ride.circles.models import Membership, Invitation
 
 # Serializers
-from ride.circles.serializers import MembershipSerializer, AddMemberSerializer
+from ride.circles.serializers import (
+    MembershipSerializer,
+    CompiledMembershipSerializer,
+    AddMemberSerializer,
+)
+
+# Utilities
+from ride.utils.pagination import KeysetPagination
+from ride.utils.middleware import timed
+from ride.utils.views import SerializerTimingMixin
+
+# Views
+from ride.circles.views.mixins import CircleNestedMixin
 
 # Permissions
 from rest_framework.permissions import IsAuthenticated
@@ -18,6 +30,8 @@ from ride.circles.permissions.memberships import IsAdminOrMembershipOwner, IsSel
 
 
 class MembershipViewSet(
+    SerializerTimingMixin,
+    CircleNestedMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.DestroyModelMixin,
@@ -27,12 +41,28 @@ class MembershipViewSet(
     """Circle membership viewset"""
 
     serializer_class = MembershipSerializer
-
-    def dispatch(self, request, *args, **kwargs):
-        """Verify that the circle exists"""
-        slug_name = kwargs["slug_name"]
-        self.circle = get_object_or_404(Circle, slug_name=slug_name)
-        return super(MembershipViewSet, self).dispatch(request, *args, **kwargs)
+    pagination_class = KeysetPagination
+    keyset = ("created", "id")
+
+    # Worst case queries with cold caches, request savepoints included
+    query_budgets = {
+        # Request savepoint, circle, token, membership, count, members, request
+        # savepoint release
+        "list": 7,
+        # Request savepoint, circle, token, membership, member, request
+        # savepoint release
+        "retrieve": 6,
+        # Request savepoint, circle, token, membership, member, deactivate,
+        # members count, request savepoint release
+        "destroy": 8,
+        # Request savepoint, circle, token, membership, remaining invitations,
+        # invited members, unused codes, insert codes, inserted codes, request
+        # savepoint release
+        "invitations": 10,
+    }
+
+    # Read only actions serialized straight from .values() rows
+    compiled_actions = ("list", "retrieve")
 
     def get_permissions(self):
         """Assign permissions based on action"""
@@ -45,23 +75,32 @@ class MembershipViewSet(
             permissions.append(IsSelfMember)
         return [p() for p in permissions]
 
+    def get_serializer_class(self):
+        """Return serializer based on action"""
+        if self.action in self.compiled_actions:
+            return CompiledMembershipSerializer
+        return MembershipSerializer
+
     def get_queryset(self):
         """Return circle members"""
-        return Membership.objects.filter(circle=self.circle, is_active=True)
+        queryset = Membership.objects.filter(circle=self.circle, is_active=True)
+        if self.action in self.compiled_actions:
+            return CompiledMembershipSerializer.prepare(queryset)
+        return queryset.select_related("user__profile", "invited_by")
 
     def get_object(self):
-        """Return the circle member by using the user's username"""
-        return get_object_or_404(
-            Membership,
-            user__username=self.kwargs["pk"],
-            circle=self.circle,
-            is_active=True,
-        )
+        """Return the circle member by using the user's username, looked
+        up once even if permissions ask for it too
+        """
+        if not hasattr(self, "_member"):
+            self._member = get_object_or_404(
+                self.get_queryset(), user__username=self.kwargs["pk"]
+            )
+        return self._member
 
     def perform_destroy(self, instance):
         """Disable membership"""
-        instance.is_active = False
-        instance.save()
+        Membership.objects.deactivate(instance)
 
     def create(self, request, *args, **kwargs):
         serializer = AddMemberSerializer(
@@ -81,9 +120,18 @@ class MembershipViewSet(
         used its invitations and another list containing the
         invitations that haven't being used yet.
         """
-        member = self.get_object()
-        invited_members = Membership.objects.filter(
-            circle=self.circle, invited_by=request.user, is_active=True
+        # IsSelfMember made sure the member is the requesting user
+        member = self.get_membership()
+        # The cached membership may predate the last invitation used
+        remaining_invitations = (
+            Membership.objects.filter(pk=member.pk)
+            .values_list("remaining_invitations", flat=True)
+            .get()
+        )
+        invited_members = CompiledMembershipSerializer.prepare(
+            Membership.objects.filter(
+                circle=self.circle, invited_by=request.user, is_active=True
+            )
         )
 
         unused_invitations = Invitation.objects.filter(
@@ -92,18 +140,18 @@ class MembershipViewSet(
             used=False,
         ).values_list("code")
 
-        diff = member.remaining_invitations - len(unused_invitations)
+        diff = remaining_invitations - len(unused_invitations)
 
         invitations = [invitation[0] for invitation in unused_invitations]
-        for _ in range(0, diff):
-            invitations.append(
-                Invitation.objects.create(
-                    issued_by=request.user, circle=self.circle
-                ).code
+        if diff > 0:
+            invitations += Invitation.objects.bulk_create_codes(
+                self.circle, request.user, diff
             )
 
         data = {
-            "used_invitations": MembershipSerializer(invited_members, many=True).data,
+            "used_invitations": timed(
+                CompiledMembershipSerializer(invited_members, many=True)
+            ).data,
             "invitations": invitations,
         }
 
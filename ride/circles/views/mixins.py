@@ -0,0 +1,34 @@
+# Django
+from django.http import Http404
+
+# Models
+from ride.circles.models import Circle, Membership
+
+
+class CircleNestedMixin:
+    """Circle nested views mixin
+    Resolve the circle from the URL before dispatching and the
+    requesting user's membership at most once per request
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """Verify that the circle exists"""
+        self.circle = Circle.objects.get_by_slug(kwargs["slug_name"])
+        if self.circle is None:
+            raise Http404("No Circle matches the given query.")
+        return super(CircleNestedMixin, self).dispatch(request, *args, **kwargs)
+
+    def get_membership(self):
+        """Return the requesting user's active membership in the circle"""
+        if not hasattr(self, "_membership"):
+            self._membership = Membership.objects.get_active(
+                self.request.user, self.circle
+            )
+        return self._membership
+
+    def get_serializer_context(self):
+        """Add circle and membership to serializer context"""
+        context = super(CircleNestedMixin, self).get_serializer_context()
+        context["circle"] = self.circle
+        context["membership"] = self.get_membership()
+        return context
@@ -1,7 +1,26 @@
-# import pytest
+import pytest
 
-# from ride.users.models import User
-# from ride.users.tests.factories import UserFactory
+from ride.utils import metrics
+from ride.utils.cache import clear_caches
+
+from ride.users.models import User
+from ride.users.tests.factories import UserFactory
+
+
+@pytest.fixture(autouse=True)
+def caches():
+    """Start every test with empty caches"""
+    clear_caches()
+
+
+@pytest.fixture(autouse=True)
+def query_budgets():
+    """Fail tests whose requests go over a view's query budget"""
+    metrics.pop_over_budget()
+    yield
+    messages = metrics.pop_over_budget()
+    if messages:
+        pytest.fail("\n".join(messages))
 
 
 # @pytest.fixture(autouse=True)
@@ -9,6 +28,6 @@
 #     settings.MEDIA_ROOT = tmpdir.strpath
 
 
-# @pytest.fixture
-# def user() -> User:
-#     return UserFactory()
+@pytest.fixture
+def user() -> User:
+    return UserFactory()
@@ -0,0 +1,93 @@
+"""Benchmark the listing serializers"""
+
+import time
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Models
+from ride.circles.models import Membership
+from ride.rides.models import Ride
+
+# Serializers
+from ride.circles.serializers import MembershipSerializer, CompiledMembershipSerializer
+from ride.rides.serializers import RideModelSerializer, CompiledRideSerializer
+
+
+class Command(BaseCommand):
+    """Time the listing of the existing rides and memberships with their
+    ModelSerializer and with their compiled serializer, and report the
+    cost per item of fetching the rows and of serializing them. The
+    compiled serializers query the nested lists while serializing, the
+    model ones prefetch them while fetching, so compare the totals too
+    """
+
+    help = "Compare the per item cost of the model and compiled serializers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=500, help="Items listed per run"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs, the best one is kept"
+        )
+
+    def handle(self, *args, **options):
+        limit = options["limit"]
+        repeat = max(options["repeat"], 1)
+        rides = Ride.objects.order_by("departure_date", "id")
+        members = Membership.objects.filter(is_active=True).order_by("created", "id")
+        if not rides.exists() and not members.exists():
+            raise CommandError("No rides nor memberships to serialize")
+
+        cases = (
+            (
+                "rides",
+                RideModelSerializer,
+                rides.with_details(),
+                CompiledRideSerializer,
+                rides,
+            ),
+            (
+                "memberships",
+                MembershipSerializer,
+                members.select_related("user__profile", "invited_by"),
+                CompiledMembershipSerializer,
+                members,
+            ),
+        )
+        for name, serializer, queryset, compiled, rows in cases:
+            before = self.measure(serializer, queryset[:limit], repeat)
+            after = self.measure(compiled, compiled.prepare(rows)[:limit], repeat)
+            if before is None:
+                continue
+            self.stdout.write(f"{name}: {before['items']} items, us/item")
+            for step in ("fetch", "serialize", "total"):
+                self.stdout.write(
+                    f"  {step:<10} {before[step]:>9.1f} -> {after[step]:>9.1f} "
+                    f"({before[step] / after[step]:.1f}x)"
+                )
+
+    def measure(self, serializer, queryset, repeat):
+        """Return the best fetch and serialization times per item, in
+        microseconds, of listing `queryset` with `serializer`
+        """
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            items = list(queryset.all())
+            fetched = time.perf_counter()
+            serializer(items, many=True).data
+            end = time.perf_counter()
+            runs.append((fetched - start, end - fetched, end - start))
+        if not items:
+            return None
+        fetch, serialize, total = (
+            min(times) * 1e6 / len(items) for times in zip(*runs)
+        )
+        return {
+            "items": len(items),
+            "fetch": fetch,
+            "serialize": serialize,
+            "total": total,
+        }
@@ -0,0 +1,490 @@
+"""Generate a large synthetic dataset"""
+
+import csv
+import io
+import random
+import time
+from array import array
+from datetime import timedelta
+from functools import partial
+
+# Django
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Models
+from ride.circles.models import Circle, Membership, Invitation
+from ride.rides.models import Ride, Rating
+from ride.users.models import User, Profile
+
+# Utilities
+from ride.utils import geo
+
+FIRST_NAMES = "Andrés Camila Juan Valentina Santiago Daniela Mateo Sofía".split()
+LAST_NAMES = "Núñez Gómez Rodríguez López Martínez García Pérez Torres".split()
+STREETS = ("Calle", "Carrera", "Avenida", "Diagonal", "Transversal")
+RATINGS = (1, 2, 3, 4, 5)
+RATING_WEIGHTS = (1, 1, 2, 4, 6)
+
+# Fields whose values the database driver may not take as they are
+ADAPTED_TYPES = ("DateField", "DateTimeField", "TimeField", "DecimalField")
+
+
+def skewed(rng, n, skew):
+    """Return an index below `n`, 0 being the most likely
+    Indexes follow a power law, the top tenth of them gets 0.1 ** (1 / skew)
+    of the picks: 10% with a skew of 1 (uniform), 46% with 3
+    """
+    return min(int(n * rng.random() ** skew), n - 1)
+
+
+class BulkLoader:
+    """Buffer rows of several models and insert them in batches
+    Postgres loads them with COPY, other databases with INSERTs. Rows
+    are dicts by attname and are written as given: explicit primary keys,
+    no defaults and no auto_now, so every non null column must be given.
+    Buffers are flushed in the order models are first added, add parents
+    before their children.
+    """
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.tables = {}
+        self.counts = {}
+        self.pending = 0
+
+    def add(self, model, **row):
+        if model not in self.tables:
+            self.tables[model] = ([model._meta.get_field(name) for name in row], [])
+            self.counts[model] = 0
+        fields, rows = self.tables[model]
+        rows.append([row[field.attname] for field in fields])
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for model, (fields, rows) in self.tables.items():
+            if not rows:
+                continue
+            if connection.vendor == "postgresql":
+                self.copy(model, fields, rows)
+            else:
+                self.insert(model, fields, rows)
+            self.counts[model] += len(rows)
+            rows.clear()
+        self.pending = 0
+
+    def copy(self, model, fields, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([r"\N" if value is None else value for value in row])
+        buffer.seek(0)
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer,
+            )
+
+    def insert(self, model, fields, rows):
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+        placeholders = ", ".join(["%s"] * len(fields))
+        # Adapting every value costs more than the insert itself
+        real_connection = connections[DEFAULT_DB_ALIAS]
+        adapt = [
+            (i, partial(field.get_db_prep_save, connection=real_connection))
+            for i, field in enumerate(fields)
+            if field.get_internal_type() in ADAPTED_TYPES
+        ]
+        for row in rows:
+            for i, prep in adapt:
+                row[i] = prep(row[i])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows
+            )
+
+
+class Command(BaseCommand):
+    """Generate users with their profiles, circles, memberships,
+    invitations, rides with passengers and ratings at production volumes,
+    e.g. --users 2000000 --circles 20000 --rides 5000000
+
+    Circles and drivers are picked with a power law, so a few hot circles
+    hold most members and rides, and in each circle a few power drivers
+    offer most rides. The same seed and options always generate the same
+    rows. Counters, members counts and ratings summaries are rebuilt at
+    the end and the tables are analyzed, ready for EXPLAIN.
+    """
+
+    help = "Generate a large synthetic dataset with bulk inserts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100000)
+        parser.add_argument("--circles", type=int, default=1000)
+        parser.add_argument("--rides", type=int, default=200000)
+        parser.add_argument(
+            "--memberships",
+            type=float,
+            default=2.0,
+            help="Average circles joined per user",
+        )
+        parser.add_argument(
+            "--invitations",
+            type=float,
+            default=1.0,
+            help="Average unused invitations per member",
+        )
+        parser.add_argument(
+            "--ratings",
+            type=float,
+            default=0.5,
+            help="Share of the passengers of finished rides rating them",
+        )
+        parser.add_argument(
+            "--circle-skew",
+            type=float,
+            default=2.0,
+            help="Concentration of members and rides in hot circles, 1 is uniform",
+        )
+        parser.add_argument(
+            "--driver-skew",
+            type=float,
+            default=3.0,
+            help="Concentration of a circle's rides in its power drivers",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        if options["users"] < 2 or options["circles"] < 1:
+            raise CommandError("At least 2 users and 1 circle are needed")
+        self.rng = random.Random(options["seed"])
+        self.now = timezone.now().replace(microsecond=0)
+        self.loader = BulkLoader(options["batch_size"])
+        start = time.perf_counter()
+
+        with transaction.atomic():
+            self.users = self.generate_users(options)
+            self.circles = self.generate_circles(options)
+            self.members = self.generate_memberships(options)
+            self.generate_rides(options)
+            self.loader.flush()
+            self.reset_sequences()
+
+            # Fresh statistics, or the planner walks the new rows blindly
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            call_command("rebuild_members_count", stdout=self.stdout)
+            call_command("rebuild_ratings", stdout=self.stdout)
+            self.rebuild_counters()
+
+        for model, count in self.loader.counts.items():
+            self.stdout.write(f"{model._meta.db_table}: {count} rows")
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"Generated in {elapsed:.1f}s"))
+
+    def next_id(self, model):
+        return (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+    def ago(self, days):
+        """Return a random date within the last `days` days"""
+        return self.now - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def generate_users(self, options):
+        """Insert users and their profiles, return the user ids and
+        the dates they joined
+        """
+        password = make_password("admin123.")
+        self.first_user = self.next_id(User)
+        self.first_profile = self.next_id(Profile)
+        users = range(self.first_user, self.first_user + options["users"])
+        joined = []
+        for pk in users:
+            date = self.ago(730)
+            joined.append(date)
+            self.loader.add(
+                User,
+                id=pk,
+                password=password,
+                last_login=None,
+                is_superuser=False,
+                username=f"user{pk}",
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                email=f"user{pk}@example.com",
+                is_staff=False,
+                is_active=True,
+                date_joined=date,
+                phone=f"+57{self.rng.randrange(3000000000, 3200000000)}",
+                is_client=True,
+                is_verified=True,
+                created=date,
+                modified=date,
+            )
+            self.loader.add(
+                Profile,
+                id=self.profile_id(pk),
+                user_id=pk,
+                picture=None,
+                biography="",
+                rides_taken=0,
+                rides_offered=0,
+                reputation=5.0,
+                ratings_sum=0,
+                ratings_count=0,
+                created=date,
+                modified=date,
+            )
+        return list(zip(users, joined))
+
+    def profile_id(self, user_id):
+        return self.first_profile + user_id - self.first_user
+
+    def generate_circles(self, options):
+        """Insert circles, hottest first, return their ids and centers"""
+        first = self.next_id(Circle)
+        circles = []
+        for pk in range(first, first + options["circles"]):
+            date = self.ago(1000)
+            center = (self.rng.uniform(4.5, 4.8), self.rng.uniform(-74.2, -74.0))
+            circles.append((pk, center))
+            self.loader.add(
+                Circle,
+                id=pk,
+                name=f"Circle {pk}",
+                slug_name=f"circle-{pk}",
+                about="Synthetic circle",
+                picture=None,
+                rides_taken=0,
+                rides_offered=0,
+                members_count=0,
+                verified=self.rng.random() < 0.1,
+                is_public=self.rng.random() < 0.5,
+                is_limited=False,
+                members_limit=0,
+                created=date,
+                modified=date,
+            )
+        return circles
+
+    def generate_memberships(self, options):
+        """Insert memberships, with the invitation every member but the
+        founder used to join and the unused ones, return the member ids of
+        each circle in joining order
+        """
+        members = [array("q") for _ in self.circles]
+        pk = self.next_id(Membership)
+        code = self.next_id(Invitation)
+        n_circles = len(self.circles)
+        for user, joined in self.users:
+            k = round(self.rng.expovariate(1 / options["memberships"]))
+            k = min(max(k, 1), n_circles)
+            picked = set()
+            while len(picked) < k:
+                picked.add(skewed(self.rng, n_circles, options["circle_skew"]))
+
+            for index in sorted(picked):
+                circle = self.circles[index][0]
+                circle_members = members[index]
+                date = joined + (self.now - joined) * self.rng.random()
+                inviter = None
+                if circle_members:
+                    inviter = self.rng.choice(circle_members)
+                    self.add_invitation(code, circle, inviter, date, used_by=user)
+                    code += 1
+
+                unused = int(options["invitations"])
+                unused += self.rng.random() < options["invitations"] % 1
+                for _ in range(unused):
+                    self.add_invitation(code, circle, user, date)
+                    code += 1
+
+                self.loader.add(
+                    Membership,
+                    id=pk,
+                    user_id=user,
+                    profile_id=self.profile_id(user),
+                    circle_id=circle,
+                    is_admin=not circle_members,
+                    used_invitations=0,
+                    remaining_invitations=unused,
+                    invited_by_id=inviter,
+                    rides_taken=0,
+                    rides_offered=0,
+                    is_active=True,
+                    created=date,
+                    modified=date,
+                )
+                pk += 1
+                circle_members.append(user)
+        return members
+
+    def add_invitation(self, n, circle, issued_by, date, used_by=None):
+        """Add an invitation with a unique code, random looking but seeded"""
+        self.loader.add(
+            Invitation,
+            code=f"{self.rng.getrandbits(32):08x}{n:x}",
+            issued_by_id=issued_by,
+            used_by_id=used_by,
+            circle_id=circle,
+            used=used_by is not None,
+            used_at=date if used_by is not None else None,
+            created=date,
+            modified=date,
+        )
+
+    def generate_rides(self, options):
+        """Insert rides with their passengers, and the ratings of the
+        passengers of the finished ones
+        """
+        # Circles that can have a ride, hottest first
+        circles = [
+            (pk, center, members)
+            for (pk, center), members in zip(self.circles, self.members)
+            if len(members) >= 2
+        ]
+        if not circles:
+            raise CommandError("No circle has 2 members, add users or memberships")
+
+        first = self.next_id(Ride)
+        for pk in range(first, first + options["rides"]):
+            index = skewed(self.rng, len(circles), options["circle_skew"])
+            circle, center, members = circles[index]
+            driver = members[skewed(self.rng, len(members), options["driver_skew"])]
+            seats = self.rng.randint(1, 4)
+            candidates = self.rng.sample(members, min(seats + 1, len(members)))
+            passengers = [user for user in candidates if user != driver]
+            passengers = passengers[: self.rng.randint(0, seats)]
+
+            minutes = self.rng.randint(-120 * 24 * 60, 14 * 24 * 60)
+            departure_date = self.now + timedelta(minutes=minutes)
+            arrival_date = departure_date + timedelta(minutes=self.rng.randint(15, 90))
+            created = departure_date - timedelta(hours=self.rng.randint(1, 72))
+            created = min(created, self.now)
+            finished = arrival_date < self.now
+            departure = self.around(center)
+            arrival = self.around(center)
+
+            self.loader.add(
+                Ride,
+                id=pk,
+                offered_by_id=driver,
+                offered_in_id=circle,
+                available_seats=seats - len(passengers),
+                comments="",
+                departure_location=self.location(),
+                departure_date=departure_date,
+                arrival_location=self.location(),
+                arrival_date=arrival_date,
+                departure_latitude=departure[0],
+                departure_longitude=departure[1],
+                arrival_latitude=arrival[0],
+                arrival_longitude=arrival[1],
+                departure_cell=geo.cell_for(*departure),
+                arrival_cell=geo.cell_for(*arrival),
+                rating=None,
+                ratings_sum=0,
+                ratings_count=0,
+                is_active=not finished,
+                created=created,
+                modified=arrival_date if finished else created,
+            )
+            for user in passengers:
+                self.loader.add(Ride.passengers.through, ride_id=pk, user_id=user)
+                if finished and self.rng.random() < options["ratings"]:
+                    self.loader.add(
+                        Rating,
+                        ride_id=pk,
+                        circle_id=circle,
+                        rating_user_id=user,
+                        rated_user_id=driver,
+                        comments="",
+                        rating=self.rng.choices(RATINGS, RATING_WEIGHTS)[0],
+                        created=arrival_date,
+                        modified=arrival_date,
+                    )
+
+    def around(self, center):
+        """Return a point a few kilometers away from `center`"""
+        latitude, longitude = center
+        return (
+            round(latitude + self.rng.gauss(0, 0.03), 6),
+            round(longitude + self.rng.gauss(0, 0.03), 6),
+        )
+
+    def location(self):
+        """Return a random street address"""
+        street = self.rng.choice(STREETS)
+        number = self.rng.randint(1, 200)
+        return (
+            f"{street} {number} #{self.rng.randint(1, 120)}-{self.rng.randint(1, 99)}"
+        )
+
+    def reset_sequences(self):
+        """Move the primary key sequences past the explicit ids"""
+        models = [User, Profile, Circle, Membership, Ride]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    def rebuild_counters(self):
+        """Set the rides offered and taken of every circle, membership
+        and profile, and the used invitations of every membership
+        """
+        Passenger = Ride.passengers.through
+
+        def count(queryset, group_by):
+            counts = queryset.order_by().values(group_by).annotate(n=Count("pk"))
+            return Coalesce(Subquery(counts.values("n")), 0)
+
+        Circle.objects.update(
+            rides_offered=count(
+                Ride.objects.filter(offered_in=OuterRef("pk")), "offered_in"
+            ),
+            rides_taken=count(
+                Passenger.objects.filter(ride__offered_in=OuterRef("pk")),
+                "ride__offered_in",
+            ),
+        )
+        Membership.objects.update(
+            rides_offered=count(
+                Ride.objects.filter(
+                    offered_in=OuterRef("circle_id"), offered_by=OuterRef("user_id")
+                ),
+                "offered_by",
+            ),
+            rides_taken=count(
+                Passenger.objects.filter(
+                    ride__offered_in=OuterRef("circle_id"), user=OuterRef("user_id")
+                ),
+                "user",
+            ),
+            used_invitations=count(
+                Invitation.objects.filter(
+                    circle=OuterRef("circle_id"),
+                    issued_by=OuterRef("user_id"),
+                    used=True,
+                ),
+                "issued_by",
+            ),
+        )
+        Profile.objects.update(
+            rides_offered=count(
+                Ride.objects.filter(offered_by=OuterRef("user_id")), "offered_by"
+            ),
+            rides_taken=count(
+                Passenger.objects.filter(user=OuterRef("user_id")), "user"
+            ),
+        )
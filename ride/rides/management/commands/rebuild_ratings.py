@@ -0,0 +1,52 @@
+"""Rebuild rating summaries"""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+# Models
+from ride.rides.models import Ride, Rating
+from ride.users.models import Profile
+
+# Serializers
+from ride.rides.serializers.ratings import rounded_average
+
+
+class Command(BaseCommand):
+    """Recompute the ratings sum, count and average of every ride
+    and profile from the ratings table, repairing any drift in the
+    incrementally maintained summaries
+    """
+
+    help = "Rebuild ride ratings and user reputations from scratch"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            ratings = Rating.objects.filter(ride=OuterRef("pk"))
+            rides = Ride.objects.update(**self.summary(ratings, "ride", "rating"))
+
+            ratings = Rating.objects.filter(rated_user=OuterRef("user_id"))
+            profiles = Profile.objects.update(
+                **self.summary(ratings, "rated_user", "reputation", default=5.0)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {rides} rides and {profiles} profiles")
+        )
+
+    def summary(self, ratings, group_by, average_field, default=None):
+        """Return the update that sets the summary of each row
+        from the given correlated ratings queryset
+        """
+        ratings = ratings.order_by().values(group_by)
+        total = ratings.annotate(total=Sum("rating")).values("total")
+        count = ratings.annotate(count=Count("pk")).values("count")
+        average = rounded_average(Subquery(total), Subquery(count))
+        if default is not None:
+            average = Coalesce(average, default)
+        return {
+            "ratings_sum": Coalesce(Subquery(total), 0),
+            "ratings_count": Coalesce(Subquery(count), 0),
+            average_field: average,
+        }
@@ -0,0 +1,55 @@
+# Django
+from django.db import models
+from django.db.models import F, Prefetch
+from django.utils import timezone
+
+# Models
+from ride.users.models import User
+
+# Utilities
+from ride.utils import geo
+
+
+class RideQuerySet(models.QuerySet):
+    """Ride queryset
+    Used to preload the relations walked by the ride serializers
+    """
+
+    def with_details(self):
+        """Join the driver, its profile and the circle, and prefetch
+        the passengers with their profiles in a single extra query
+        """
+        passengers = User.objects.select_related("profile")
+        return self.select_related(
+            "offered_by__profile", "offered_in"
+        ).prefetch_related(Prefetch("passengers", queryset=passengers))
+
+    def upcoming(self):
+        """Filter the open rides that have not departed yet
+        The range scan of the open rides partial index starts at the
+        current time, so departed rides are never read
+        """
+        return self.filter(
+            is_active=True, available_seats__gte=1, departure_date__gte=timezone.now()
+        )
+
+    def departing_near(self, latitude, longitude, radius):
+        """Filter rides whose departure cell is within `radius` km of a point"""
+        cells = geo.cells_around(latitude, longitude, radius)
+        return self.filter(departure_cell__in=cells)
+
+    def arriving_near(self, latitude, longitude, radius):
+        """Filter rides whose arrival cell is within `radius` km of a point"""
+        cells = geo.cells_around(latitude, longitude, radius)
+        return self.filter(arrival_cell__in=cells)
+
+    def take_seat(self, pk):
+        """Decrement the available seats of an active ride if any is left
+        The check and the decrement run in a single conditional UPDATE, so
+        concurrent joins can never oversell a ride. Return whether a seat
+        was taken
+        """
+        taken = self.filter(pk=pk, is_active=True, available_seats__gte=1).update(
+            available_seats=F("available_seats") - 1
+        )
+        return taken == 1
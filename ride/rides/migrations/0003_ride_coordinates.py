@@ -0,0 +1,96 @@
+# Generated by Django 3.1.13 on 2026-10-18 02:54
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rides", "0002_rating"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ride",
+            name="arrival_cell",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Geohash cell of the arrival point",
+                max_length=12,
+            ),
+        ),
+        migrations.AddField(
+            model_name="ride",
+            name="arrival_latitude",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-90),
+                    django.core.validators.MaxValueValidator(90),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="ride",
+            name="arrival_longitude",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-180),
+                    django.core.validators.MaxValueValidator(180),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="ride",
+            name="departure_cell",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Geohash cell of the departure point",
+                max_length=12,
+            ),
+        ),
+        migrations.AddField(
+            model_name="ride",
+            name="departure_latitude",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-90),
+                    django.core.validators.MaxValueValidator(90),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="ride",
+            name="departure_longitude",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-180),
+                    django.core.validators.MaxValueValidator(180),
+                ],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ride",
+            index=models.Index(
+                fields=["offered_in", "departure_cell", "departure_date"],
+                name="ride_departure_cell_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ride",
+            index=models.Index(
+                fields=["offered_in", "arrival_cell", "departure_date"],
+                name="ride_arrival_cell_idx",
+            ),
+        ),
+    ]
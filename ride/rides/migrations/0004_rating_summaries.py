@@ -0,0 +1,50 @@
+# Generated by Django 3.1.13 on 2026-10-18 03:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_summaries(apps, schema_editor):
+    """Compute the ratings sum and count of existing rides and profiles"""
+    Ride = apps.get_model("rides", "Ride")
+    Rating = apps.get_model("rides", "Rating")
+    Profile = apps.get_model("users", "Profile")
+
+    for model, lookup, group_by in (
+        (Ride, {"ride": OuterRef("pk")}, "ride"),
+        (Profile, {"rated_user": OuterRef("user_id")}, "rated_user"),
+    ):
+        ratings = Rating.objects.filter(**lookup).order_by().values(group_by)
+        total = ratings.annotate(total=Sum("rating")).values("total")
+        count = ratings.annotate(count=Count("pk")).values("count")
+        model.objects.update(
+            ratings_sum=Coalesce(Subquery(total), 0),
+            ratings_count=Coalesce(Subquery(count), 0),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rides", "0003_ride_coordinates"),
+        ("users", "0003_rating_summaries"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ride",
+            name="ratings_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of ratings the ride has received"
+            ),
+        ),
+        migrations.AddField(
+            model_name="ride",
+            name="ratings_sum",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Sum of the ratings the ride has received"
+            ),
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
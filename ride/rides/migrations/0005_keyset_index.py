@@ -0,0 +1,20 @@
+# Generated by Django 3.1.13 on 2026-10-18 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rides", "0004_rating_summaries"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ride",
+            index=models.Index(
+                fields=["offered_in", "departure_date", "id"],
+                name="ride_departure_date_idx",
+            ),
+        ),
+    ]
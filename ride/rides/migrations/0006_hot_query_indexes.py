@@ -0,0 +1,31 @@
+# Generated by Django 3.1.13 on 2026-10-18 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rides", "0005_keyset_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="ride",
+            name="ride_departure_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["circle", "ride", "rating_user"], name="rating_user_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ride",
+            index=models.Index(
+                condition=models.Q(("available_seats__gte", 1), ("is_active", True)),
+                fields=["offered_in", "departure_date", "id"],
+                name="ride_open_departure_idx",
+            ),
+        ),
+    ]
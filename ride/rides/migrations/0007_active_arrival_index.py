@@ -0,0 +1,21 @@
+# Generated by Django 3.1.13 on 2026-10-18 03:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rides", "0006_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ride",
+            index=models.Index(
+                condition=models.Q(is_active=True),
+                fields=["arrival_date"],
+                name="ride_active_arrival_idx",
+            ),
+        ),
+    ]
@@ -41,3 +41,11 @@ class Rating(RideModel):
         return "@{} rated {} @{}".format(
             self.rating_user.username, self.rating, self.rated_user.username
         )
+
+    class Meta(RideModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["circle", "ride", "rating_user"],
+                name="rating_user_idx",
+            ),
+        ]
@@ -1,9 +1,14 @@
 # Django
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
 # Utilities
+from ride.utils import geo
 from ride.utils.models import RideModel
 
+# Managers
+from ride.rides.managers import RideQuerySet
+
 
 class Ride(RideModel):
     """Ride model"""
@@ -23,7 +28,49 @@ class Ride(RideModel):
     arrival_location = models.CharField(max_length=255)
     arrival_date = models.DateTimeField()
 
+    # Coordinates
+    departure_latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    departure_longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    arrival_latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    arrival_longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+
+    # Spatial index
+    departure_cell = models.CharField(
+        max_length=12,
+        blank=True,
+        editable=False,
+        help_text="Geohash cell of the departure point",
+    )
+    arrival_cell = models.CharField(
+        max_length=12,
+        blank=True,
+        editable=False,
+        help_text="Geohash cell of the arrival point",
+    )
+
     rating = models.FloatField(null=True)
+    ratings_sum = models.PositiveIntegerField(
+        default=0, help_text="Sum of the ratings the ride has received"
+    )
+    ratings_count = models.PositiveIntegerField(
+        default=0, help_text="Number of ratings the ride has received"
+    )
 
     is_active = models.BooleanField(
         "active status",
@@ -31,6 +78,21 @@ class Ride(RideModel):
         help_text="Used for disabling the ride or making it as finished",
     )
 
+    # Manager
+    objects = RideQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        """Keep the spatial index cells in sync with the coordinates"""
+        self.locate()
+        super(Ride, self).save(*args, **kwargs)
+
+    def locate(self):
+        """Compute departure and arrival cells from the coordinates"""
+        self.departure_cell = geo.cell_for(
+            self.departure_latitude, self.departure_longitude
+        )
+        self.arrival_cell = geo.cell_for(self.arrival_latitude, self.arrival_longitude)
+
     def __str__(self):
         """Ride details"""
         return (
@@ -43,3 +105,27 @@ class Ride(RideModel):
                 end_time=self.arrival_date.strftime("%I:%M %p"),
             )
         )
+
+    class Meta(RideModel.Meta):
+        indexes = [
+            # Listing of the rides still open in a circle
+            models.Index(
+                fields=["offered_in", "departure_date", "id"],
+                name="ride_open_departure_idx",
+                condition=models.Q(is_active=True, available_seats__gte=1),
+            ),
+            # Sweep of the departed rides still active
+            models.Index(
+                fields=["arrival_date"],
+                name="ride_active_arrival_idx",
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=["offered_in", "departure_cell", "departure_date"],
+                name="ride_departure_cell_idx",
+            ),
+            models.Index(
+                fields=["offered_in", "arrival_cell", "departure_date"],
+                name="ride_arrival_cell_idx",
+            ),
+        ]
@@ -6,11 +6,11 @@ class IsRideOwner(BasePermission):
     """Verify requesting user is the ride creator"""
 
     def has_object_permission(self, request, view, obj):
-        return request.user == obj.offered_by
+        return request.user.pk == obj.offered_by_id
 
 
 class IsNotRideOnwer(BasePermission):
     """Verify requesting user is not the ride creator"""
 
     def has_object_permission(self, request, view, obj):
-        return not request.user == obj.offered_by
+        return request.user.pk != obj.offered_by_id
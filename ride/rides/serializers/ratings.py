@@ -1,11 +1,37 @@
 # Django
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import F
 
 # Django REST Framework
 from rest_framework import serializers
 
 # Models
-from ride.rides.models import Rating
+from ride.rides.models import Ride, Rating
+from ride.users.models import Profile
+
+
+def rounded_average(total, count):
+    """Return an expression with the average of the integer `total`
+    over `count`, rounded to one decimal with ties rounded up
+    Integer division keeps the result exact and the same on every
+    database, whose ROUND functions break ties differently
+    """
+    return ((total * 20 + count) / (count * 2)) / 10.0
+
+
+def running_average(value):
+    """Return an expression with the average after adding `value`
+    to the running sum and count, rounded to one decimal
+    """
+    return rounded_average(F("ratings_sum") + value, F("ratings_count") + 1)
+
+
+def add_rating(value):
+    """Return the update that adds a rating to a summary row"""
+    return {
+        "ratings_sum": F("ratings_sum") + value,
+        "ratings_count": F("ratings_count") + 1,
+    }
 
 
 class CreateRideRatingSerializer(serializers.ModelSerializer):
@@ -42,36 +68,29 @@ class CreateRideRatingSerializer(serializers.ModelSerializer):
     def create(self, data):
         """Create rating"""
 
-        offered_by = self.context["ride"].offered_by
-
-        Rating.objects.create(
-            circle=self.context["circle"],
-            ride=self.context["ride"],
-            rating_user=self.context["request"].user,
-            rated_user=offered_by,
-            **data
-        )
-
-        # Update ride rating
-        ride_avg = round(
-            Rating.objects.filter(
-                circle=self.context["circle"], ride=self.context["ride"]
-            ).aggregate(Avg("rating"))["rating__avg"],
-            1,
-        )
-
-        self.context["ride"].rating = ride_avg
-        self.context["ride"].save()
-
-        # Update user reputation
-        user_avg = round(
-            Rating.objects.filter(rated_user=offered_by).aggregate(Avg("rating"))[
-                "rating__avg"
-            ],
-            1,
-        )
-
-        offered_by.profile.reputation = user_avg
-        offered_by.profile.save()
-
-        return self.context["ride"]
+        ride = self.context["ride"]
+        offered_by = ride.offered_by
+        value = data["rating"]
+
+        with transaction.atomic():
+            Rating.objects.create(
+                circle=self.context["circle"],
+                ride=ride,
+                rating_user=self.context["request"].user,
+                rated_user=offered_by,
+                **data
+            )
+
+            # Update ride rating
+            Ride.objects.filter(pk=ride.pk).update(
+                rating=running_average(value), **add_rating(value)
+            )
+
+            # Update user reputation
+            if offered_by is not None:
+                Profile.objects.filter(user=offered_by).update(
+                    reputation=running_average(value), **add_rating(value)
+                )
+
+        ride.refresh_from_db(fields=["rating", "ratings_sum", "ratings_count"])
+        return ride
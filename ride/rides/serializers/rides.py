@@ -1,6 +1,7 @@
 from datetime import timedelta
 
 # Django
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
 # Django Rest Framework
@@ -8,11 +9,15 @@ from rest_framework import serializers
 
 # Models
 from ride.rides.models import Ride, Rating
-from ride.circles.models.memberships import Membership
-from ride.users.models import User
+from ride.circles.models import Circle, Membership
+from ride.users.models import User, Profile
+
+# Utilities
+from ride.utils import counters
 
 # Serializers
 from ride.users.serializers import UserModelSerializer
+from ride.utils.serializers import CompiledSerializer
 
 
 class CreateRideSerializer(serializers.ModelSerializer):
@@ -25,7 +30,16 @@ class CreateRideSerializer(serializers.ModelSerializer):
         """Meta class"""
 
         model = Ride
-        exclude = ("offered_in", "passengers", "rating", "is_active")
+        exclude = (
+            "offered_in",
+            "passengers",
+            "rating",
+            "is_active",
+            "departure_cell",
+            "arrival_cell",
+            "ratings_sum",
+            "ratings_count",
+        )
 
     def validate_departure_data(self, data):
         """Verify data is not in the past"""
@@ -49,41 +63,40 @@ class CreateRideSerializer(serializers.ModelSerializer):
                 "Rides offered on behalf of others are not allowed"
             )
 
-        try:
-            membership = Membership.objects.get(
-                user=user, circle=circle, is_active=True
-            )
-            self.context["membership"] = membership
-        except Membership.DoesNotExist:
+        membership = self.context.get("membership")
+        if membership is None:
+            membership = Membership.objects.get_active(user, circle)
+        if membership is None:
             raise serializers.ValidationError(
                 "User is not an active member of the circle"
             )
+        self.context["membership"] = membership
 
         if data["arrival_date"] < data["departure_date"]:
             raise serializers.ValidationError(
                 "Departure date must happen before arrival date"
             )
 
+        for point in ("departure", "arrival"):
+            latitude = data.get(f"{point}_latitude")
+            longitude = data.get(f"{point}_longitude")
+            if (latitude is None) ^ (longitude is None):
+                raise serializers.ValidationError(
+                    f"Both {point} latitude and longitude must be provided"
+                )
+
         return data
 
     def create(self, data):
         """Create ride and update stats"""
         circle = self.context["circle"]
-        ride = Ride.objects.create(**data, offered_in=circle)
-
-        # Circle
-        circle.rides_offered += 1
-        circle.save()
-
-        # Membership
         membership = self.context["membership"]
-        membership.rides_offered += 1
-        membership.save()
+        ride = Ride.objects.create(**data, offered_in=circle)
 
-        # Profile
-        profile = data["offered_by"].profile
-        profile.rides_offered += 1
-        profile.save()
+        # Circle, membership and profile stats
+        counters.increment(Circle, circle.pk, "rides_offered")
+        counters.increment(Membership, membership.pk, "rides_offered")
+        counters.increment(Profile, membership.profile_id, "rides_offered")
 
         return ride
 
@@ -124,7 +137,12 @@ class RideModelSerializer(serializers.ModelSerializer):
         """Meta class"""
 
         model = Ride
-        fields = "__all__"
+        exclude = (
+            "departure_cell",
+            "arrival_cell",
+            "ratings_sum",
+            "ratings_count",
+        )
         read_only_fields = ("offered_in", "offered_by", "is_active")
 
     def update(self, instance, validated_data):
@@ -135,6 +153,15 @@ class RideModelSerializer(serializers.ModelSerializer):
         return super(RideModelSerializer, self).update(instance, validated_data)
 
 
+class CompiledRideSerializer(CompiledSerializer):
+    """Ride listing serializer
+    Same output as RideModelSerializer, built from .values() rows
+    """
+
+    serializer_class = RideModelSerializer
+    related_strings = {"offered_in": "offered_in__name"}
+
+
 # GET request to {{host}}/circles/pycol/rides/?search=170
 # RESPONSE
 # {
@@ -227,21 +254,22 @@ class JoinRideSerializer(serializers.ModelSerializer):
 
     def validate_passenger(self, data):
         """Verify passenger exists and is a circle member"""
-        try:
-            user = User.objects.get(pk=data)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("Invalid passenger")
+        request = self.context.get("request")
+        if request is not None and request.user.pk == data:
+            # Requesting user, its membership was resolved by the view
+            user = request.user
+            membership = self.context.get("membership")
+        else:
+            try:
+                user = User.objects.get(pk=data)
+            except User.DoesNotExist:
+                raise serializers.ValidationError("Invalid passenger")
+            membership = None
 
         circle = self.context["circle"]
-        # if not Membership.object.filter(
-        #     user=user, circle=circle, is_active=True
-        # ).exists():
-        #     raise serializers.ValidationError("Invalid passenger")
-        try:
-            membership = Membership.objects.get(
-                user=user, circle=circle, is_active=True
-            )
-        except Membership.DoesNotExist:
+        if membership is None:
+            membership = Membership.objects.get_active(user, circle)
+        if membership is None:
             raise serializers.ValidationError(
                 "User is not an active member of the circle"
             )
@@ -258,7 +286,7 @@ class JoinRideSerializer(serializers.ModelSerializer):
         if ride.available_seats < 1:
             raise serializers.ValidationError("Ride is already full")
 
-        if Ride.objects.filter(passengers__pk=data["passenger"]).exists():
+        if ride.passengers.filter(pk=data["passenger"]).exists():
             raise serializers.ValidationError("Passenger already in this trip")
 
         return data
@@ -269,27 +297,24 @@ class JoinRideSerializer(serializers.ModelSerializer):
         user = self.context["user"]
         circle = self.context["circle"]
 
-        # Add passenger to ride
-        ride.passengers.add(user)
-        # Decrease available seats
-        ride.available_seats -= 1
-
-        # User stats
-        profile = user.profile
-        profile.rides_taken += 1
-        profile.save()
-
-        # Membership
+        with transaction.atomic():
+            # Decrease available seats
+            if not Ride.objects.take_seat(ride.pk):
+                raise serializers.ValidationError("Ride is already full")
+            # Add passenger to ride, a concurrent join of the same user
+            # hits the unique constraint and gives the seat back
+            try:
+                Ride.passengers.through.objects.create(ride=ride, user=user)
+            except IntegrityError:
+                raise serializers.ValidationError("Passenger already in this trip")
+
+        # Circle, membership and profile stats
         membership = self.context["membership"]
-        membership.rides_taken += 1
-        membership.save()
-
-        # Circle
-        circle = self.context["circle"]
-        circle.rides_taken += 1
-        circle.save()
+        counters.increment(Circle, circle.pk, "rides_taken")
+        counters.increment(Membership, membership.pk, "rides_taken")
+        counters.increment(Profile, membership.profile_id, "rides_taken")
 
-        return ride
+        return Ride.objects.with_details().get(pk=ride.pk)
 
 
 # POST request to {{host}}/circles/pycol/rides/1/join/
@@ -367,7 +392,6 @@ class EndRideSerializer(serializers.ModelSerializer):
 
     def validate_current_time(self, data):
         """Verify ride have indeed started"""
-        ride = self.context["view"].get_object()
-        if data <= ride.departure_date:
+        if data <= self.instance.departure_date:
             raise serializers.ValidationError("Ride has not started  yet")
         return data
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+# Django
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Utilities
+from ride.utils import geo
+
+
+class NearbyRidesSerializer(serializers.Serializer):
+    """Nearby rides query serializer
+    Validate the query params of a spatial ride search. Rides can be
+    searched by departure point (near me), by arrival point (going near X)
+    or both, inside a departure time window
+    """
+
+    from_latitude = serializers.FloatField(required=False, min_value=-90, max_value=90)
+    from_longitude = serializers.FloatField(
+        required=False, min_value=-180, max_value=180
+    )
+    to_latitude = serializers.FloatField(required=False, min_value=-90, max_value=90)
+    to_longitude = serializers.FloatField(required=False, min_value=-180, max_value=180)
+
+    radius = serializers.FloatField(default=2, min_value=0.1, max_value=geo.MAX_RADIUS)
+
+    departure_after = serializers.DateTimeField(required=False)
+    departure_before = serializers.DateTimeField(required=False)
+
+    limit = serializers.IntegerField(default=20, min_value=1, max_value=100)
+
+    def validate(self, data):
+        """Verify at least one complete point and a valid time window"""
+        points = []
+        for point in ("from", "to"):
+            latitude = data.get(f"{point}_latitude")
+            longitude = data.get(f"{point}_longitude")
+            if (latitude is None) ^ (longitude is None):
+                raise serializers.ValidationError(
+                    f"Both {point} latitude and longitude must be provided"
+                )
+            if latitude is not None:
+                points.append(point)
+        if not points:
+            raise serializers.ValidationError(
+                "A departure or arrival point must be provided"
+            )
+
+        after = data.setdefault("departure_after", timezone.now())
+        before = data.setdefault("departure_before", after + timedelta(days=1))
+        if before < after:
+            raise serializers.ValidationError("Time window must end after it starts")
+        return data
+
+
+class MatchRidesSerializer(serializers.Serializer):
+    """Ride matching query serializer
+    Validate the query params of a passenger looking for a ride from an
+    origin to a destination, departing around a given time
+    """
+
+    from_latitude = serializers.FloatField(min_value=-90, max_value=90)
+    from_longitude = serializers.FloatField(min_value=-180, max_value=180)
+    to_latitude = serializers.FloatField(min_value=-90, max_value=90)
+    to_longitude = serializers.FloatField(min_value=-180, max_value=180)
+
+    # How far the passenger is willing to walk to and from the ride
+    radius = serializers.FloatField(default=2, min_value=0.1, max_value=geo.MAX_RADIUS)
+
+    departure = serializers.DateTimeField(required=False)
+    window = serializers.IntegerField(
+        default=60, min_value=5, max_value=24 * 60, help_text="Minutes"
+    )
+
+    limit = serializers.IntegerField(default=20, min_value=1, max_value=100)
+
+    def validate(self, data):
+        """Compute the departure time window, never in the past"""
+        now = timezone.now()
+        departure = data.setdefault("departure", now)
+        window = timedelta(minutes=data["window"])
+        data["departure_after"] = max(departure - window, now)
+        data["departure_before"] = departure + window
+        if data["departure_before"] < data["departure_after"]:
+            raise serializers.ValidationError("Departure must not be in the past")
+        return data
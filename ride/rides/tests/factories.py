@@ -0,0 +1,63 @@
+"""Ride factories"""
+
+from datetime import timedelta
+
+# Django
+from django.utils import timezone
+
+# Factory boy
+import factory
+from factory.django import DjangoModelFactory
+
+# Models
+from ride.rides.models import Ride, Rating
+
+# Factories
+from ride.circles.tests.factories import CircleFactory
+from ride.users.tests.factories import UserFactory
+
+
+class RideFactory(DjangoModelFactory):
+    """Open ride departing within the next week"""
+
+    offered_by = factory.SubFactory(UserFactory)
+    offered_in = factory.SubFactory(CircleFactory)
+    available_seats = factory.Faker("random_int", min=1, max=4)
+    comments = factory.Faker("sentence")
+
+    departure_location = factory.Faker("street_address")
+    departure_date = factory.Faker(
+        "date_time_between", start_date="+30m", end_date="+7d", tzinfo=timezone.utc
+    )
+    arrival_location = factory.Faker("street_address")
+    arrival_date = factory.LazyAttribute(
+        lambda ride: ride.departure_date + timedelta(minutes=45)
+    )
+
+    departure_latitude = factory.Faker("pyfloat", min_value=4.5, max_value=4.8)
+    departure_longitude = factory.Faker("pyfloat", min_value=-74.2, max_value=-74.0)
+    arrival_latitude = factory.Faker("pyfloat", min_value=4.5, max_value=4.8)
+    arrival_longitude = factory.Faker("pyfloat", min_value=-74.2, max_value=-74.0)
+
+    class Meta:
+        model = Ride
+
+    @factory.post_generation
+    def passengers(self, create, extracted, **kwargs):
+        """Add the given passengers, e.g. RideFactory(passengers=users)"""
+        if create and extracted:
+            self.passengers.add(*extracted)
+
+
+class RatingFactory(DjangoModelFactory):
+    """Rating of a ride by one of its passengers"""
+
+    ride = factory.SubFactory(RideFactory)
+    circle = factory.LazyAttribute(lambda rating: rating.ride.offered_in)
+    rating_user = factory.SubFactory(UserFactory)
+    rated_user = factory.LazyAttribute(lambda rating: rating.ride.offered_by)
+    rating = factory.Faker("random_int", min=1, max=5)
+    comments = factory.Faker("sentence")
+
+    class Meta:
+        model = Rating
@@ -0,0 +1,63 @@
+"""Buffered counters tests"""
+
+from unittest import mock
+
+# Django
+from django.test import TestCase
+
+# Models
+from ride.circles.models import Circle
+
+# Utilities
+from ride.utils import counters
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class CountersFlushTestCase(TestCase):
+    """Buffered counters flush test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        if fakeredis is None:
+            self.skipTest("fakeredis is required, see requirements/local.txt")
+        self.redis = fakeredis.FakeRedis()
+        patcher = mock.patch.object(counters, "get_redis", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.circle = Circle.objects.create(name="College", slug_name="college")
+
+    def buffer(self, by):
+        counters.buffer(Circle, self.circle.pk, ["rides_offered"], by)
+
+    def test_flush(self):
+        """Increments are written once and the buffers emptied"""
+        self.buffer(2)
+        self.buffer(1)
+        self.assertEqual(counters.flush(), 1)
+        self.assertEqual(counters.flush(), 0)
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_offered, 3)
+        self.assertEqual(self.redis.keys(), [])
+
+    def test_overlapping_flushes(self):
+        """A flush starting while another one is running loses nothing"""
+        rename = self.redis.rename
+        overlapped = []
+
+        def rename_then_flush(src, dst):
+            result = rename(src, dst)
+            if not overlapped:
+                overlapped.append(True)
+                self.buffer(3)
+                counters.flush()
+            return result
+
+        self.buffer(2)
+        with mock.patch.object(self.redis, "rename", rename_then_flush):
+            counters.flush()
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_offered, 5)
@@ -0,0 +1,67 @@
+"""Synthetic dataset tests"""
+
+import io
+
+# Django
+from django.core.management import call_command
+from django.db.models import Count, Q
+from django.test import TestCase
+
+# Models
+from ride.circles.models import Circle, Membership, Invitation
+from ride.rides.models import Ride
+from ride.users.models import User, Profile
+
+
+class GenerateDatasetTestCase(TestCase):
+    """Dataset generator command test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        call_command(
+            "generate_dataset",
+            users=60,
+            circles=5,
+            rides=100,
+            batch_size=50,
+            stdout=io.StringIO(),
+        )
+
+    def test_rows(self):
+        """Every model gets its rows and the hot circle the most members"""
+        self.assertEqual(User.objects.count(), 60)
+        self.assertEqual(Profile.objects.count(), 60)
+        self.assertEqual(Circle.objects.count(), 5)
+        self.assertEqual(Ride.objects.count(), 100)
+        self.assertGreaterEqual(Membership.objects.count(), 60)
+        self.assertEqual(
+            Invitation.objects.filter(used=True).count(),
+            Membership.objects.filter(is_admin=False).count(),
+        )
+        circles = list(Circle.objects.order_by("pk"))
+        self.assertEqual(
+            circles[0].members_count, max(c.members_count for c in circles)
+        )
+
+    def test_counters(self):
+        """Counters match the generated rows"""
+        circles = Circle.objects.annotate(
+            active=Count(
+                "membership", filter=Q(membership__is_active=True), distinct=True
+            ),
+            offered=Count("ride", distinct=True),
+        )
+        for circle in circles:
+            self.assertEqual(circle.members_count, circle.active)
+            self.assertEqual(circle.rides_offered, circle.offered)
+
+        profiles = Profile.objects.annotate(offered=Count("user__ride"))
+        for profile in profiles:
+            self.assertEqual(profile.rides_offered, profile.offered)
+
+    def test_sequences(self):
+        """New rows get ids past the generated ones"""
+        user = User.objects.create(
+            email="new@example.com", username="new", phone="+573000000000"
+        )
+        self.assertEqual(user.pk, User.objects.order_by("pk")[59].pk + 1)
@@ -0,0 +1,51 @@
+"""Departed rides sweep tests"""
+
+import io
+from datetime import timedelta
+
+# Django
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+# Models
+from ride.rides.models import Ride
+
+# Commands
+from ride.taskapp.management.commands import finish_rides
+
+
+class FinishRidesTestCase(TestCase):
+    """Departed rides worker test case"""
+
+    def create_ride(self, arrival):
+        """Create a ride arriving at `arrival`"""
+        return Ride.objects.create(
+            departure_location="calle 140",
+            departure_date=arrival - timedelta(minutes=30),
+            arrival_location="calle 170",
+            arrival_date=arrival,
+        )
+
+    def test_sweep(self):
+        """Only the rides past the grace period are finished, in batches"""
+        now = timezone.now()
+        departed = [self.create_ride(now - timedelta(hours=i + 2)) for i in range(5)]
+        recent = self.create_ride(now - timedelta(minutes=10))
+        upcoming = self.create_ride(now + timedelta(hours=1))
+
+        out = io.StringIO()
+        with self.assertLogs(finish_rides.logger, "INFO") as logs:
+            call_command("finish_rides", grace=60, batch_size=2, stdout=out)
+        self.assertIn("Finished 5 rides in 3 batches", out.getvalue())
+        [record] = logs.records
+        self.assertEqual((record.swept, record.batches), (5, 3))
+        self.assertFalse(
+            Ride.objects.filter(pk__in=[r.pk for r in departed], is_active=True)
+        )
+        active = Ride.objects.filter(is_active=True)
+        self.assertEqual(set(active), {recent, upcoming})
+
+        out = io.StringIO()
+        call_command("finish_rides", stdout=out)
+        self.assertIn("Finished 0 rides in 0 batches", out.getvalue())
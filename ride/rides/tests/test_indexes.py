@@ -0,0 +1,95 @@
+"""Index usage tests"""
+
+import re
+from datetime import timedelta
+
+# Django
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+# Models
+from ride.circles.models import Circle, Membership, Invitation
+from ride.rides.models import Ride, Rating
+from ride.users.models import User
+
+
+class HotQueryIndexTestCase(TestCase):
+    """Hot query plans test case
+    Every query the API runs on each request must be answered from an
+    index, never by scanning the whole table
+    """
+
+    def setUp(self):
+        """Test case setup"""
+        self.circle = Circle(pk=1)
+        self.user = User(pk=1)
+        self.ride = Ride(pk=1)
+
+    def explain(self, queryset):
+        """Return the query plan of `queryset`"""
+        if connection.vendor == "postgresql":
+            # Tiny test tables are cheaper to scan, rule that out
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def assertIndexScan(self, queryset, index):
+        """Assert the plan of `queryset` reads `index` and does not scan
+        a whole table
+        """
+        plan = self.explain(queryset)
+        self.assertIn(index, plan)
+        if connection.vendor == "postgresql":
+            self.assertNotIn("Seq Scan", plan)
+        elif connection.vendor == "sqlite":
+            for line in plan.splitlines():
+                self.assertIsNone(re.search(r"\bSCAN (TABLE )?\w+$", line), plan)
+
+    def test_open_rides(self):
+        queryset = (
+            Ride.objects.upcoming()
+            .filter(offered_in=self.circle)
+            .order_by("departure_date", "id")
+        )
+        self.assertIndexScan(queryset, "ride_open_departure_idx")
+
+    def test_active_membership(self):
+        queryset = Membership.objects.filter(
+            user=self.user, circle=self.circle, is_active=True
+        ).order_by()[:1]
+        self.assertIndexScan(queryset, "membership_user_circle_idx")
+
+    def test_circle_members(self):
+        queryset = Membership.objects.filter(
+            circle=self.circle, is_active=True
+        ).order_by("created", "id")
+        self.assertIndexScan(queryset, "membership_created_idx")
+
+    def test_unused_invitations(self):
+        queryset = Invitation.objects.filter(
+            circle=self.circle, issued_by=self.user, used=False
+        )
+        self.assertIndexScan(queryset, "invitation_issuer_idx")
+
+    def test_rating_emitted(self):
+        queryset = Rating.objects.filter(
+            circle=self.circle, ride=self.ride, rating_user=self.user
+        )
+        self.assertIndexScan(queryset, "rating_user_idx")
+
+    def test_ride_matching(self):
+        queryset = Ride.objects.filter(
+            offered_in=self.circle,
+            is_active=True,
+            available_seats__gte=1,
+            departure_date__gte=timezone.now(),
+            departure_date__lte=timezone.now() + timedelta(hours=1),
+        ).departing_near(4.7110, -74.0721, 2)
+        self.assertIndexScan(queryset, "ride_departure_cell_idx")
+
+    def test_departed_rides(self):
+        queryset = Ride.objects.filter(
+            is_active=True, arrival_date__lt=timezone.now()
+        ).order_by("arrival_date")
+        self.assertIndexScan(queryset, "ride_active_arrival_idx")
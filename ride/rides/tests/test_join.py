@@ -0,0 +1,134 @@
+"""Ride join tests"""
+
+import random
+import threading
+import time
+from datetime import timedelta
+
+# Django
+from django.db import OperationalError, connection, transaction
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Models
+from ride.circles.models import Membership
+from ride.rides.models import Ride
+from ride.users.models import Profile
+
+# Factories
+from ride.circles.tests.factories import CircleFactory, MembershipFactory
+from ride.rides.tests.factories import RideFactory
+
+# Serializers
+from ride.rides.serializers import JoinRideSerializer
+
+
+class JoinRideConcurrencyTestCase(TransactionTestCase):
+    """Concurrent seat reservation test case"""
+
+    SEATS = 5
+    PASSENGERS = 40
+    ATTEMPTS = 500
+
+    def setUp(self):
+        """Test case setup"""
+        self.circle = CircleFactory()
+        driver = MembershipFactory(circle=self.circle).user
+        self.passengers = [
+            MembershipFactory(circle=self.circle).user for _ in range(self.PASSENGERS)
+        ]
+        self.ride = RideFactory(
+            offered_by=driver,
+            offered_in=self.circle,
+            available_seats=self.SEATS,
+            departure_date=timezone.now() + timedelta(days=1),
+        )
+
+    def join(self, user, barrier, results):
+        """Join the ride as `user` in its own connection and transaction"""
+        barrier.wait()
+        try:
+            for _ in range(self.ATTEMPTS):
+                try:
+                    with transaction.atomic():
+                        ride = Ride.objects.get(pk=self.ride.pk)
+                        serializer = JoinRideSerializer(
+                            ride,
+                            data={"passenger": user.pk},
+                            context={"ride": ride, "circle": self.circle},
+                            partial=True,
+                        )
+                        serializer.is_valid(raise_exception=True)
+                        serializer.save()
+                except serializers.ValidationError:
+                    results.append("rejected")
+                    return
+                except OperationalError:
+                    # SQLite refuses concurrent writers instead of queueing
+                    # them, retry like a client would
+                    time.sleep(random.random() / 100)
+                    continue
+                results.append("joined")
+                return
+            results.append("locked")
+        finally:
+            connection.close()
+
+    def test_concurrent_joins_never_oversell(self):
+        """Many simultaneous joins must take at most the available seats"""
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("In-memory SQLite cannot queue concurrent writers")
+        barrier = threading.Barrier(self.PASSENGERS)
+        results = []
+        threads = [
+            threading.Thread(target=self.join, args=(user, barrier, results))
+            for user in self.passengers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.ride.refresh_from_db()
+        self.assertEqual(results.count("joined"), self.SEATS)
+        self.assertEqual(results.count("rejected"), self.PASSENGERS - self.SEATS)
+        self.assertEqual(self.ride.available_seats, 0)
+        self.assertEqual(self.ride.passengers.count(), self.SEATS)
+
+    def test_join_twice_is_rejected(self):
+        """A passenger cannot take two seats in the same ride"""
+        user = self.passengers[0]
+        for _ in range(2):
+            serializer = JoinRideSerializer(
+                self.ride,
+                data={"passenger": user.pk},
+                context={"ride": self.ride, "circle": self.circle},
+                partial=True,
+            )
+            valid = serializer.is_valid()
+            if valid:
+                serializer.save()
+        self.assertFalse(valid)
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.available_seats, self.SEATS - 1)
+
+    def test_join_updates_stats(self):
+        """Joining a ride counts it as taken for the circle, member and profile"""
+        user = self.passengers[0]
+        serializer = JoinRideSerializer(
+            self.ride,
+            data={"passenger": user.pk},
+            context={"ride": self.ride, "circle": self.circle},
+            partial=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_taken, 1)
+        membership = Membership.objects.get(user=user, circle=self.circle)
+        self.assertEqual(membership.rides_taken, 1)
+        self.assertEqual(Profile.objects.get(user=user).rides_taken, 1)
@@ -0,0 +1,105 @@
+"""Request metrics tests"""
+
+from datetime import timedelta
+from unittest import mock
+
+# Django
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+
+# Factories
+from ride.circles.tests.factories import CircleFactory, MembershipFactory
+
+# Models
+from ride.rides.models import Ride
+
+# Serializers
+from ride.rides.serializers import RideModelSerializer
+
+# Views
+from ride.rides.views.rides import RideViewSet
+
+# Utilities
+from ride.utils import metrics
+from ride.utils.cache import clear_caches
+from ride.utils.middleware import timed
+
+
+class QueryMetricsAPITestCase(APITestCase):
+    """Query metrics middleware test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        metrics.reset()
+        self.circle = CircleFactory()
+        self.user = MembershipFactory(circle=self.circle).user
+
+        # Auth
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+        # URL
+        self.url = f"/circles/{self.circle.slug_name}/rides/"
+
+    def test_actions_are_recorded(self):
+        """Every action gets its own figures, only staff can read them"""
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        response = self.client.get("/metrics/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get("/metrics/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.data["RideViewSet.list"]
+        self.assertEqual(stats["requests"], 2)
+        self.assertGreater(stats["max_queries"], 0)
+        self.assertGreaterEqual(stats["total_ms"], stats["db_ms"])
+        self.assertGreater(stats["serializer_ms"], 0)
+
+    def test_serializers_outside_requests(self):
+        """Serializers are only timed when a view asks for it"""
+        serializer = RideModelSerializer(Ride.objects.none(), many=True)
+        self.assertFalse(getattr(type(serializer), "timed", False))
+        self.assertEqual(timed(serializer).data, [])
+
+    def test_query_budget(self):
+        """Going over an action's query budget is reported"""
+        with mock.patch.object(RideViewSet, "query_budgets", {"list": 1}):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [message] = metrics.pop_over_budget()
+        self.assertIn("RideViewSet.list ran", message)
+
+    def test_budgets_hold(self):
+        """Actions stay within their query budgets, with cold caches"""
+        members = f"/circles/{self.circle.slug_name}/members/"
+        departure = timezone.now() + timedelta(days=1)
+        requests = [
+            ("get", members, status.HTTP_200_OK),
+            ("get", f"{members}{self.user.username}/", status.HTTP_200_OK),
+            (
+                "post",
+                self.url,
+                status.HTTP_201_CREATED,
+                {
+                    "available_seats": 3,
+                    "departure_location": "calle 140",
+                    "departure_date": departure.isoformat(),
+                    "arrival_location": "calle 170",
+                    "arrival_date": (departure + timedelta(hours=1)).isoformat(),
+                },
+            ),
+            ("delete", f"{members}{self.user.username}/", status.HTTP_204_NO_CONTENT),
+        ]
+        for method, url, expected, *data in requests:
+            clear_caches()
+            response = getattr(self.client, method)(url, *data, format="json")
+            self.assertEqual(response.status_code, expected, url)
+        self.assertEqual(metrics.pop_over_budget(), [])
@@ -0,0 +1,92 @@
+"""Ride ratings tests"""
+
+from datetime import timedelta
+from io import StringIO
+
+# Django
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APIRequestFactory
+
+# Models
+from ride.rides.models import Ride
+from ride.users.models import Profile
+
+# Factories
+from ride.circles.tests.factories import CircleFactory
+from ride.rides.tests.factories import RideFactory
+from ride.users.tests.factories import UserFactory
+
+# Serializers
+from ride.rides.serializers import CreateRideRatingSerializer
+
+
+class RideRatingTestCase(TestCase):
+    """Ride rating summaries test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.circle = CircleFactory()
+        self.driver = UserFactory()
+        self.passengers = UserFactory.create_batch(4)
+        self.ride = RideFactory(
+            offered_by=self.driver,
+            offered_in=self.circle,
+            departure_date=timezone.now() - timedelta(hours=1),
+            passengers=self.passengers,
+        )
+
+    def rate(self, user, rating):
+        """Rate the ride as `user`"""
+        request = APIRequestFactory().post("/")
+        request.user = user
+        serializer = CreateRideRatingSerializer(
+            data={"rating": rating},
+            context={"request": request, "circle": self.circle, "ride": self.ride},
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_ratings_update_running_averages(self):
+        """Each rating updates the ride and driver summaries in place"""
+        for user, rating in zip(self.passengers, (5, 4, 4)):
+            ride = self.rate(user, rating)
+
+        self.assertEqual(ride.ratings_sum, 13)
+        self.assertEqual(ride.ratings_count, 3)
+        self.assertEqual(ride.rating, 4.3)
+
+        profile = Profile.objects.get(user=self.driver)
+        self.assertEqual(profile.ratings_count, 3)
+        self.assertEqual(profile.reputation, 4.3)
+
+    def test_ties_round_up(self):
+        """Averages halfway between tenths round up, also when rebuilt"""
+        for user, rating in zip(self.passengers, (5, 4, 4, 4)):
+            ride = self.rate(user, rating)
+        self.assertEqual(ride.rating, 4.3)
+        self.assertEqual(Profile.objects.get(user=self.driver).reputation, 4.3)
+
+        call_command("rebuild_ratings", stdout=StringIO())
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.rating, 4.3)
+        self.assertEqual(Profile.objects.get(user=self.driver).reputation, 4.3)
+
+    def test_rebuild_repairs_drift(self):
+        """The rebuild command recomputes summaries from the ratings table"""
+        self.rate(self.passengers[0], 2)
+        self.rate(self.passengers[1], 3)
+        Ride.objects.update(ratings_sum=0, ratings_count=7, rating=1)
+        Profile.objects.update(ratings_sum=99, reputation=1)
+
+        call_command("rebuild_ratings", stdout=StringIO())
+
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.ratings_sum, 5)
+        self.assertEqual(self.ride.ratings_count, 2)
+        self.assertEqual(self.ride.rating, 2.5)
+        self.assertEqual(Profile.objects.get(user=self.driver).reputation, 2.5)
+        self.assertEqual(Profile.objects.get(user=self.passengers[0]).reputation, 5)
@@ -0,0 +1,121 @@
+"""JSON renderer and parser tests"""
+
+import importlib
+import io
+import sys
+import uuid
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+# Django
+from django.test import TestCase
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+# Models
+from ride.circles.models import Circle
+from ride.rides.models import Ride
+
+# Factories
+from ride.circles.tests.factories import CircleFactory
+from ride.rides.tests.factories import RideFactory
+from ride.users.tests.factories import UserFactory
+
+# Serializers
+from ride.rides.serializers import RideModelSerializer
+
+# Utilities
+from ride.utils import renderers
+from ride.utils.renderers import FastJSONParser, FastJSONRenderer
+
+
+class FastJSONTestCase(TestCase):
+    """orjson renderer and parser compatibility test case"""
+
+    def assertSameBytes(self, data, accepted_media_type=None):
+        """Both renderers must produce exactly the same output"""
+        expected = JSONRenderer().render(data, accepted_media_type)
+        self.assertEqual(FastJSONRenderer().render(data, accepted_media_type), expected)
+        self.assertNotIn(b"\xe2\x80\xa8", expected)
+
+    def test_ride_payload(self):
+        """Nested ride payloads render byte for byte as before"""
+        circle = CircleFactory(name="Bogotá", about="Ñandú 🚗")
+        user = UserFactory(
+            last_name="Pérez", profile__biography="línea\u2028otra\u2029fin"
+        )
+        RideFactory(
+            offered_by=user,
+            offered_in=circle,
+            departure_location="Calle 140 #7-20",
+            departure_latitude=4.7110,
+            departure_longitude=-74.0721,
+            departure_date=timezone.now(),
+            arrival_location="Chía",
+            comments='"quoted" \\ backslash </script>',
+            passengers=[user],
+        )
+        rides = Ride.objects.with_details()
+        self.assertSameBytes(RideModelSerializer(rides, many=True).data)
+
+    def test_python_values(self):
+        """Values handled by DRF's encoder are formatted the same way"""
+        self.assertSameBytes(
+            {
+                "aware": timezone.now(),
+                "naive": datetime(2021, 12, 5, 17, 26, 49, 194603),
+                "date": date(2021, 12, 5),
+                "time": time(17, 26, 49, 194603),
+                "timedelta": timedelta(minutes=15),
+                "decimal": Decimal("4.30"),
+                "uuid": uuid.uuid4(),
+                "bytes": b"ride",
+                "queryset": Circle.objects.none(),
+                "numbers": [0, -1, 2**63 - 1, 4.3, 0.1, -74.0721, True, None],
+                1: "integer key",
+            }
+        )
+        # Over 64 bits, rendered by the stdlib
+        self.assertSameBytes({"big": 2**70})
+
+    def test_indent(self):
+        """Indented output falls back to the stdlib renderer"""
+        self.assertSameBytes({"a": [1, 2]}, "application/json; indent=4")
+
+    def test_parse(self):
+        """Bodies are parsed as before, errors included"""
+        for body in (
+            b'{"ride": "Bogot\\u00e1", "seats": 3, "points": [4.711, -74.0721]}',
+            '{"ride": "Bogotá"}'.encode(),
+            b'{"big": 1180591620717411303424}',
+        ):
+            self.assertEqual(
+                FastJSONParser().parse(io.BytesIO(body)),
+                JSONParser().parse(io.BytesIO(body)),
+            )
+        for body in (b'{"broken": ', b'{"nan": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
+
+    def test_without_orjson(self):
+        """Without orjson installed the stdlib renders and parses"""
+        data = {"ride": "Bogotá", "seats": 3, "when": timezone.now()}
+        body = b'{"ride": "Bogot\\u00e1", "seats": 3}'
+        try:
+            with mock.patch.dict(sys.modules, {"orjson": None}):
+                module = importlib.reload(renderers)
+            self.assertIsNone(module.orjson)
+            self.assertEqual(
+                module.FastJSONRenderer().render(data), JSONRenderer().render(data)
+            )
+            self.assertEqual(
+                module.FastJSONParser().parse(io.BytesIO(body)),
+                JSONParser().parse(io.BytesIO(body)),
+            )
+        finally:
+            importlib.reload(renderers)
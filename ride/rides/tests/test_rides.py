@@ -0,0 +1,296 @@
+"""Rides tests"""
+
+from datetime import timedelta
+
+# Django
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+
+# Models
+from ride.rides.models import Ride
+
+# Factories
+from ride.circles.tests.factories import CircleFactory, MembershipFactory
+from ride.rides.tests.factories import RideFactory
+
+# Utilities
+from ride.utils.cache import clear_caches
+
+
+class RideListQueriesAPITestCase(APITestCase):
+    """Ride listing query count test case"""
+
+    # Request savepoint and release, circle, token, membership,
+    # count, rides and passengers
+    LIST_QUERIES = 8
+
+    def setUp(self):
+        """Test case setup"""
+        self.circle = CircleFactory(verified=True)
+        self.user = MembershipFactory(circle=self.circle).user
+        passengers = [MembershipFactory(circle=self.circle).user for _ in range(3)]
+
+        departure = timezone.now() + timedelta(days=1)
+        for i in range(10):
+            RideFactory(
+                offered_by=self.user,
+                offered_in=self.circle,
+                available_seats=5,
+                departure_date=departure + timedelta(hours=i),
+                passengers=passengers,
+            )
+
+        # Auth
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+        # URL
+        self.url = f"/circles/{self.circle.slug_name}/rides/"
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        """Listing rides must issue the same queries for any page size"""
+        for limit in (1, 3, 10):
+            clear_caches()
+            with self.assertNumQueries(self.LIST_QUERIES):
+                response = self.client.get(self.url, {"limit": limit})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["results"]), limit)
+
+    def test_list_serializes_passengers(self):
+        """Prefetched passengers and profiles must be rendered"""
+        response = self.client.get(self.url, {"limit": 1})
+        ride = response.data["results"][0]
+        self.assertEqual(ride["offered_by"]["username"], self.user.username)
+        self.assertEqual(ride["offered_in"], self.circle.name)
+        self.assertEqual(len(ride["passengers"]), 3)
+        self.assertIn("reputation", ride["passengers"][0]["profile"])
+
+    def test_retrieve_queries(self):
+        """Retrieving a ride must not query per passenger"""
+        ride = Ride.objects.first()
+        # Request savepoint and release, circle, token, membership,
+        # ride and passengers
+        with self.assertNumQueries(7):
+            response = self.client.get(f"{self.url}{ride.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class RidePaginationAPITestCase(APITestCase):
+    """Ride listing keyset pagination test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.circle = CircleFactory()
+        self.user = MembershipFactory(circle=self.circle).user
+
+        # Rides departing at the same time must not be skipped nor repeated
+        departure = timezone.now() + timedelta(days=1)
+        for i in range(8):
+            RideFactory(
+                offered_by=self.user,
+                offered_in=self.circle,
+                departure_date=departure + timedelta(hours=i // 3),
+            )
+        self.expected = list(
+            Ride.objects.order_by("departure_date", "id").values_list("id", flat=True)
+        )
+
+        # Auth
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+        # URL
+        self.url = f"/circles/{self.circle.slug_name}/rides/"
+
+    def test_walk_pages(self):
+        """Following next and then previous links visits every ride once"""
+        response = self.client.get(self.url, {"limit": 3})
+        self.assertEqual(response.data["count"], 8)
+        self.assertIsNone(response.data["previous"])
+        pages = [[ride["id"] for ride in response.data["results"]]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            pages.append([ride["id"] for ride in response.data["results"]])
+        self.assertEqual(sum(pages, []), self.expected)
+
+        for page in reversed(pages[:-1]):
+            response = self.client.get(response.data["previous"])
+            self.assertEqual([ride["id"] for ride in response.data["results"]], page)
+        self.assertIsNone(response.data["previous"])
+
+    def test_skip_count(self):
+        """The total count is optional"""
+        response = self.client.get(self.url, {"limit": 3, "count": "false"})
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_invalid_cursor(self):
+        """Tampered cursors are rejected"""
+        response = self.client.get(self.url, {"cursor": "nope"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_departed_rides_are_hidden(self):
+        """Departed rides are neither listed nor joinable, but still retrievable"""
+        ride = RideFactory(
+            offered_by=self.user,
+            offered_in=self.circle,
+            departure_date=timezone.now() - timedelta(minutes=10),
+        )
+        response = self.client.get(self.url, {"limit": 20})
+        self.assertEqual(
+            [ride["id"] for ride in response.data["results"]], self.expected
+        )
+        response = self.client.post(f"{self.url}{ride.pk}/join/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(f"{self.url}{ride.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class NearbyRidesAPITestCase(APITestCase):
+    """Spatial ride search test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.circle = CircleFactory()
+        self.user = MembershipFactory(circle=self.circle).user
+
+        departure = timezone.now() + timedelta(hours=2)
+        self.near = self.create_ride((4.7110, -74.0721), (4.6500, -74.0600), departure)
+        self.close = self.create_ride((4.7200, -74.0721), (4.6000, -74.1000), departure)
+        self.far = self.create_ride((4.9000, -74.0721), (4.6500, -74.0600), departure)
+        self.later = self.create_ride(
+            (4.7110, -74.0721), (4.6500, -74.0600), departure + timedelta(days=3)
+        )
+
+        # Auth
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+        # URL
+        self.url = f"/circles/{self.circle.slug_name}/rides/nearby/"
+
+    def create_ride(self, origin, destination, departure):
+        """Create a ride between two points"""
+        return RideFactory(
+            offered_by=self.user,
+            offered_in=self.circle,
+            departure_latitude=origin[0],
+            departure_longitude=origin[1],
+            departure_date=departure,
+            arrival_latitude=destination[0],
+            arrival_longitude=destination[1],
+        )
+
+    def test_cells_are_computed(self):
+        """Saving a ride must index its departure and arrival points"""
+        self.assertEqual(len(self.near.departure_cell), 5)
+        self.assertNotEqual(self.near.departure_cell, self.near.arrival_cell)
+
+    def test_rides_near_me(self):
+        """Only rides departing inside the radius and window are listed, closest first"""
+        response = self.client.get(
+            self.url, {"from_latitude": 4.7110, "from_longitude": -74.0721, "radius": 3}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [ride["id"] for ride in response.data], [self.near.pk, self.close.pk]
+        )
+        self.assertEqual(response.data[0]["distance"], 0)
+
+    def test_rides_going_near(self):
+        """Rides can also be searched by their arrival point"""
+        response = self.client.get(
+            self.url,
+            {
+                "from_latitude": 4.7110,
+                "from_longitude": -74.0721,
+                "to_latitude": 4.6500,
+                "to_longitude": -74.0600,
+                "radius": 3,
+            },
+        )
+        self.assertEqual([ride["id"] for ride in response.data], [self.near.pk])
+
+    def test_a_point_is_required(self):
+        """Searching without coordinates is rejected"""
+        response = self.client.get(self.url, {"radius": 3})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class MatchRidesAPITestCase(APITestCase):
+    """Ride matching test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.circle = CircleFactory()
+        self.user = MembershipFactory(circle=self.circle).user
+
+        self.origin = (4.7110, -74.0721)
+        self.destination = (4.6500, -74.0600)
+        self.departure = timezone.now() + timedelta(hours=2)
+        self.exact = self.create_ride(self.origin, self.destination, 0)
+        self.early = self.create_ride(self.origin, self.destination, -50)
+        self.offset = self.create_ride((4.7200, -74.0721), self.destination, 20)
+        self.late = self.create_ride(self.origin, self.destination, 120)
+        self.elsewhere = self.create_ride(self.origin, (4.9000, -74.0721), 0)
+
+        # Auth
+        token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+        # URL
+        self.url = f"/circles/{self.circle.slug_name}/rides/match/"
+
+    def create_ride(self, origin, destination, minutes):
+        """Create a ride departing `minutes` after the desired departure"""
+        departure = self.departure + timedelta(minutes=minutes)
+        return RideFactory(
+            offered_by=self.user,
+            offered_in=self.circle,
+            departure_latitude=origin[0],
+            departure_longitude=origin[1],
+            departure_date=departure,
+            arrival_latitude=destination[0],
+            arrival_longitude=destination[1],
+        )
+
+    def match(self, **params):
+        """Request the matches of the test trip"""
+        query = {
+            "from_latitude": self.origin[0],
+            "from_longitude": self.origin[1],
+            "to_latitude": self.destination[0],
+            "to_longitude": self.destination[1],
+            "departure": self.departure.isoformat(),
+            **params,
+        }
+        return self.client.get(self.url, query)
+
+    def test_ranking(self):
+        """Rides are ranked by detour and time difference, inside the window"""
+        response = self.match()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [ride["id"] for ride in response.data],
+            [self.exact.pk, self.offset.pk, self.early.pk],
+        )
+        self.assertEqual(response.data[0]["detour"], 0)
+        self.assertEqual(response.data[0]["time_difference"], 0)
+        self.assertGreater(response.data[1]["detour"], 0)
+        self.assertEqual(response.data[2]["time_difference"], 50)
+
+    def test_window_and_radius(self):
+        """The time window and the radius bound the matches"""
+        response = self.match(window=30, radius=0.5)
+        self.assertEqual([ride["id"] for ride in response.data], [self.exact.pk])
+
+    def test_destination_is_required(self):
+        """Matching needs both ends of the trip"""
+        response = self.client.get(
+            self.url, {"from_latitude": 4.7110, "from_longitude": -74.0721}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,109 @@
+"""Compiled serializers tests"""
+
+import io
+from datetime import timedelta
+
+# Django
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+# Models
+from ride.circles.models import Membership
+from ride.rides.models import Ride
+
+# Factories
+from ride.circles.tests.factories import CircleFactory, MembershipFactory
+from ride.rides.tests.factories import RideFactory
+from ride.users.tests.factories import UserFactory
+
+# Serializers
+from ride.circles.serializers import MembershipSerializer, CompiledMembershipSerializer
+from ride.rides.serializers import RideModelSerializer, CompiledRideSerializer
+
+
+class CompiledSerializersTestCase(TestCase):
+    """Compiled serializers output test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.circle = CircleFactory(slug_name="college")
+        self.driver = self.create_member("driver", picture="users/pictures/d.png")
+        self.passengers = [self.create_member(f"passenger{i}") for i in range(3)]
+        self.request = APIRequestFactory().get("/circles/college/rides/")
+
+        departure = timezone.now() + timedelta(days=1)
+        for i in range(4):
+            RideFactory(
+                offered_by=self.driver if i != 1 else None,
+                offered_in=self.circle if i != 2 else None,
+                departure_date=departure + timedelta(hours=i),
+                departure_latitude=4.7110 if i % 2 else None,
+                departure_longitude=-74.0721 if i % 2 else None,
+                arrival_location="Chía",
+                rating=4.5 if i == 3 else None,
+                passengers=self.passengers[:i],
+            )
+
+    def create_member(self, username, picture=None):
+        """Create a user with profile and an active membership in the circle"""
+        user = UserFactory(
+            username=username, last_name="Pérez", profile__picture=picture
+        )
+        MembershipFactory(
+            user=user, circle=self.circle, invited_by=getattr(self, "driver", None)
+        )
+        return user
+
+    def assertSameOutput(self, expected, data):
+        """Both outputs must render to the same bytes"""
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(data), renderer.render(expected))
+
+    def test_rides(self):
+        """Rides render as with RideModelSerializer"""
+        rides = Ride.objects.order_by("departure_date", "id")
+        for context in ({}, {"request": self.request}):
+            expected = RideModelSerializer(
+                rides.with_details(), many=True, context=context
+            ).data
+            rows = CompiledRideSerializer.prepare(rides)
+            data = CompiledRideSerializer(rows, many=True, context=context).data
+            self.assertSameOutput(expected, data)
+
+        ride = rides.last()
+        expected = RideModelSerializer(ride).data
+        data = CompiledRideSerializer(
+            CompiledRideSerializer.prepare(rides).get(pk=ride.pk)
+        ).data
+        self.assertSameOutput(expected, data)
+
+    def test_memberships(self):
+        """Members render as with MembershipSerializer"""
+        members = Membership.objects.order_by("created", "id")
+        context = {"request": self.request}
+        expected = MembershipSerializer(
+            members.select_related("user__profile", "invited_by"),
+            many=True,
+            context=context,
+        ).data
+        rows = CompiledMembershipSerializer.prepare(members)
+        data = CompiledMembershipSerializer(rows, many=True, context=context).data
+        self.assertSameOutput(expected, data)
+
+    def test_queries(self):
+        """Nested lists take a single query for every row"""
+        rows = list(CompiledRideSerializer.prepare(Ride.objects.all()))
+        with self.assertNumQueries(1):
+            CompiledRideSerializer(rows, many=True).data
+
+    def test_benchmark(self):
+        """The benchmark reports both serializers"""
+        out = io.StringIO()
+        call_command("benchmark_serializers", limit=10, repeat=1, stdout=out)
+        self.assertIn("rides: 4 items", out.getvalue())
+        self.assertIn("memberships: 4 items", out.getvalue())
@@ -12,7 +12,7 @@ from .views import rides as ride_views
 
 router = DefaultRouter()
 router.register(
-    r"circles/(?P<slug_name>[-a-zA-Z0-0_]+)/rides",
+    r"circles/(?P<slug_name>[-a-zA-Z0-9_]+)/rides",
     ride_views.RideViewSet,
     basename="ride",
 )
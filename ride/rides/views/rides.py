@@ -6,7 +6,6 @@ from django.utils import timezone
 # Django Rest Framework
 from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
-from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from ride.rides import serializers
 
@@ -14,25 +13,41 @@ from ride.rides import serializers
 from ride.rides.serializers import (
     CreateRideSerializer,
     RideModelSerializer,
+    CompiledRideSerializer,
     JoinRideSerializer,
     EndRideSerializer,
     CreateRideRatingSerializer,
+    NearbyRidesSerializer,
+    MatchRidesSerializer,
 )
 
 # Models
-from ride.circles.models.circles import Circle
 from ride.rides.models import Ride
 
+# Utilities
+from ride.utils import geo
+from ride.utils.pagination import KeysetPagination
+from ride.utils.middleware import timed
+from ride.utils.views import SerializerTimingMixin
+
+# Views
+from ride.circles.views.mixins import CircleNestedMixin
+
 # Permissions
 from rest_framework.permissions import IsAuthenticated
 from ride.circles.permissions import IsActiveCircleMember
 from ride.rides.permissions import IsRideOwner, IsNotRideOnwer
 
 # Filters
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import SearchFilter
+
+# Minutes away from the desired departure weighing as much as 1km of detour
+MINUTES_PER_KM = 5
 
 
 class RideViewSet(
+    SerializerTimingMixin,
+    CircleNestedMixin,
     viewsets.GenericViewSet,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -42,16 +57,52 @@ class RideViewSet(
     """Rides view set"""
 
     permission_classes = [IsAuthenticated, IsActiveCircleMember]
-    filter_backends = (SearchFilter, OrderingFilter)
-    ordering = ("departure_date", "arrival_date", "available_seats")
-    ordering_fields = ("departure_date", "arrival_date", "available_seats")
+    filter_backends = (SearchFilter,)
     search_fields = ("departure_location", "arrival_location")
+    pagination_class = KeysetPagination
+    keyset = ("departure_date", "id")
+
+    # Worst case queries with cold caches, request savepoints included
+    query_budgets = {
+        # Request savepoint, circle, token, membership, count, rides,
+        # passengers, request savepoint release
+        "list": 8,
+        # Request savepoint, circle, token, membership, ride, passengers,
+        # request savepoint release
+        "retrieve": 7,
+        # Request savepoint, circle, token, membership, candidates, rides,
+        # passengers, request savepoint release
+        "nearby": 8,
+        # Request savepoint, circle, token, membership, candidates, rides,
+        # passengers, request savepoint release
+        "match": 8,
+        # Request savepoint, circle, token, membership, insert ride, circle
+        # rides offered, membership rides offered, profile rides offered,
+        # request savepoint release
+        "create": 9,
+        # Request savepoint, circle, token, membership, ride, already a
+        # passenger, savepoint, take seat, insert passenger, savepoint release,
+        # circle rides taken, membership rides taken, profile rides taken, ride
+        # with driver, passengers, request savepoint release
+        "join": 16,
+        # Request savepoint, circle, token, membership, ride with driver,
+        # passengers, update ride, request savepoint release
+        "finish": 8,
+    }
+
+    # Actions that only see rides not departed yet
+    upcoming_actions = ("list", "nearby", "match", "join")
+
+    # Read only actions serialized straight from .values() rows
+    compiled_actions = ("list", "retrieve")
 
-    def dispatch(self, request, *args, **kwargs):
-        """Verify that circle exists"""
-        slug_name = kwargs["slug_name"]
-        self.circle = get_object_or_404(Circle, slug_name=slug_name)
-        return super(RideViewSet, self).dispatch(request, *args, **kwargs)
+    # Actions whose response renders RideModelSerializer
+    detailed_actions = (
+        "update",
+        "partial_update",
+        "finish",
+        "rate",
+    )
 
     def get_permissions(self):
         permissions = [IsAuthenticated, IsActiveCircleMember]
@@ -71,23 +122,140 @@ class RideViewSet(
             return JoinRideSerializer
         if self.action == "rate":
             return CreateRideRatingSerializer
+        if self.action in self.compiled_actions:
+            return CompiledRideSerializer
         return RideModelSerializer
 
-    def get_serializer_context(self):
-        """Add circle to serializer context"""
-        context = super(RideViewSet, self).get_serializer_context()
-        context["circle"] = self.circle
-        return context
-
     def get_queryset(self):
-        """Return active circle's rides"""
-        # offset = timezone.now() + timedelta(minutes=15)
-        # departure_date__gte=offset,
-        if self.action != "finish":
-            return Ride.objects.filter(
+        """Return active circle's rides, only the upcoming ones for the
+        listings and joins
+        """
+        if self.action == "finish":
+            queryset = Ride.objects.all()
+        elif self.action in self.upcoming_actions:
+            queryset = Ride.objects.upcoming().filter(offered_in=self.circle)
+        else:
+            queryset = Ride.objects.filter(
                 is_active=True, available_seats__gte=1, offered_in=self.circle
             )
-        return Ride.objects.all()
+        return self.plan_queryset(queryset)
+
+    def plan_queryset(self, queryset):
+        """Preload the relations the action is going to serialize"""
+        if self.action in self.compiled_actions:
+            return CompiledRideSerializer.prepare(queryset)
+        if self.action in self.detailed_actions:
+            return queryset.with_details()
+        return queryset
+
+    @action(detail=False, methods=["get"])
+    def nearby(self, request, *args, **kwargs):
+        """List rides departing or arriving near a point, closest first"""
+        serializer = NearbyRidesSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        radius = data["radius"]
+
+        queryset = self.get_queryset().filter(
+            departure_date__gte=data["departure_after"],
+            departure_date__lte=data["departure_before"],
+        )
+        points = []
+        if "from_latitude" in data:
+            origin = (data["from_latitude"], data["from_longitude"])
+            queryset = queryset.departing_near(*origin, radius)
+            points.append(("departure", origin))
+        if "to_latitude" in data:
+            destination = (data["to_latitude"], data["to_longitude"])
+            queryset = queryset.arriving_near(*destination, radius)
+            points.append(("arrival", destination))
+
+        # Cells are square, discard the candidates outside the radius
+        distances = {}
+        fields = [
+            f"{point}_{axis}"
+            for point, _ in points
+            for axis in ("latitude", "longitude")
+        ]
+        for row in queryset.values("pk", *fields):
+            total = 0
+            for point, (latitude, longitude) in points:
+                d = geo.distance(
+                    latitude,
+                    longitude,
+                    row[f"{point}_latitude"],
+                    row[f"{point}_longitude"],
+                )
+                if d > radius:
+                    break
+                total += d
+            else:
+                distances[row["pk"]] = total
+
+        closest = sorted(distances, key=distances.get)[: data["limit"]]
+        results = self.serialize_ranked(closest)
+        for ride in results:
+            ride["distance"] = round(distances[ride["id"]], 3)
+        return Response(results, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def match(self, request, *args, **kwargs):
+        """Rank the rides a passenger can take from an origin to a
+        destination around a departure time, by the detour the driver
+        takes to pick them up and drop them off and by how far from the
+        desired time they depart
+        """
+        serializer = MatchRidesSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        radius = data["radius"]
+        origin = (data["from_latitude"], data["from_longitude"])
+        destination = (data["to_latitude"], data["to_longitude"])
+
+        # Candidates come from the circle's cell and departure date indexes
+        queryset = (
+            self.get_queryset()
+            .filter(
+                departure_date__gte=data["departure_after"],
+                departure_date__lte=data["departure_before"],
+            )
+            .departing_near(*origin, radius)
+            .arriving_near(*destination, radius)
+        )
+        matches = {}
+        for row in queryset.values(
+            "pk",
+            "departure_date",
+            "departure_latitude",
+            "departure_longitude",
+            "arrival_latitude",
+            "arrival_longitude",
+        ):
+            start = (row["departure_latitude"], row["departure_longitude"])
+            end = (row["arrival_latitude"], row["arrival_longitude"])
+            if (
+                geo.distance(*start, *origin) > radius
+                or geo.distance(*end, *destination) > radius
+            ):
+                continue
+            detour = geo.detour(start, end, origin, destination)
+            minutes = abs((row["departure_date"] - data["departure"]).total_seconds())
+            minutes /= 60
+            matches[row["pk"]] = (detour + minutes / MINUTES_PER_KM, detour, minutes)
+
+        best = sorted(matches, key=matches.get)[: data["limit"]]
+        results = self.serialize_ranked(best)
+        for ride in results:
+            score, detour, minutes = matches[ride["id"]]
+            ride["detour"] = round(detour, 3)
+            ride["time_difference"] = round(minutes, 1)
+        return Response(results, status=status.HTTP_200_OK)
+
+    def serialize_ranked(self, pks):
+        """Return the compiled output of the rides of `pks`, in order"""
+        rows = CompiledRideSerializer.prepare(Ride.objects.filter(pk__in=pks))
+        rides = {row["id"]: row for row in rows}
+        return timed(CompiledRideSerializer([rides[pk] for pk in pks], many=True)).data
 
     @action(detail=True, methods=["post"])
     def join(self, request, *args, **kwargs):
@@ -96,15 +264,17 @@ class RideViewSet(
         ride = self.get_object()
         # partial update in serializer
         serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        context["ride"] = ride
         serializer = serializer_class(
             ride,
             data={"passenger": request.user.pk},
-            context={"ride": ride, "circle": self.circle},
+            context=context,
             partial=True,
         )
         serializer.is_valid(raise_exception=True)
         ride = serializer.save()
-        data = RideModelSerializer(ride).data
+        data = timed(RideModelSerializer(ride)).data
         return Response(data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"])
@@ -119,7 +289,7 @@ class RideViewSet(
         )
         serializer.is_valid(raise_exception=True)
         ride = serializer.save()
-        data = RideModelSerializer(ride).data
+        data = timed(RideModelSerializer(ride)).data
         return Response(data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"])
@@ -136,6 +306,6 @@ class RideViewSet(
 
         serializer.is_valid()
         ride = serializer.save()
-        data = RideModelSerializer(ride).data
+        data = timed(RideModelSerializer(ride)).data
 
         return Response(data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,8 @@
+"""Task app"""
+
+from django.apps import AppConfig
+
+
+class TaskAppConfig(AppConfig):
+    name = "ride.taskapp"
+    verbose_name = "Tasks"
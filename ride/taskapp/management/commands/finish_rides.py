@@ -0,0 +1,86 @@
+"""Finish departed rides"""
+
+import logging
+import time
+from datetime import timedelta
+
+# Django
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# Models
+from ride.rides.models import Ride
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Mark as finished the rides still active once their arrival date
+    plus a grace period has passed, so drivers that never finish their
+    rides do not keep them in the active set. Rides are swept in batches
+    of primary keys read from the partial index on active arrivals, each
+    batch in a single UPDATE
+    """
+
+    help = "Finish the rides that arrived a while ago"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace",
+            type=int,
+            default=60,
+            help="Minutes after the arrival date before a ride is finished",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rides finished per UPDATE",
+        )
+        parser.add_argument(
+            "--every",
+            type=float,
+            default=0,
+            help="Keep running and sweep every given number of seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            finished, batches = self.sweep(options["grace"], options["batch_size"])
+            elapsed = time.perf_counter() - start
+            logger.info(
+                "finish_rides finished=%d batches=%d seconds=%.3f",
+                finished,
+                batches,
+                elapsed,
+                extra={"swept": finished, "batches": batches, "seconds": elapsed},
+            )
+            self.stdout.write(f"Finished {finished} rides in {batches} batches")
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
+
+    def sweep(self, grace, size):
+        """Finish the departed rides, return the number of rides finished
+        and of batches run
+        """
+        now = timezone.now()
+        departed = Ride.objects.filter(
+            is_active=True, arrival_date__lt=now - timedelta(minutes=grace)
+        )
+        finished = batches = 0
+        while True:
+            pks = list(
+                departed.order_by("arrival_date").values_list("pk", flat=True)[:size]
+            )
+            if not pks:
+                break
+            # A driver finishing the ride meanwhile is not counted twice
+            finished += departed.filter(pk__in=pks).update(
+                is_active=False, modified=now
+            )
+            batches += 1
+            if len(pks) < size:
+                break
+        return finished, batches
@@ -0,0 +1,31 @@
+"""Flush buffered counters"""
+
+import time
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Utilities
+from ride.utils import counters
+
+
+class Command(BaseCommand):
+    """Write the stats increments buffered in Redis to the database"""
+
+    help = "Flush buffered stats counters to the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--every",
+            type=float,
+            default=0,
+            help="Keep running and flush every given number of seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            updated = counters.flush()
+            self.stdout.write(f"Flushed counters of {updated} rows")
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
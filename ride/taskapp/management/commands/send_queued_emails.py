@@ -0,0 +1,139 @@
+"""Send queued emails"""
+
+import time
+from datetime import timedelta
+
+# Django
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+# Models
+from ride.taskapp.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    """Deliver the emails waiting in the outbox
+    Each batch is claimed in a short transaction with SELECT ... FOR
+    UPDATE SKIP LOCKED, which marks the emails as sending under a lease
+    so several workers can run at once. The emails are then sent through
+    a single mail server connection outside of any transaction, and
+    failures are retried with an exponential backoff
+    """
+
+    help = "Send the queued emails"
+
+    # Time a worker has to send a claimed batch before other workers
+    # claim it again
+    lease = timedelta(minutes=10)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Emails sent per connection",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=5,
+            help="Give up on an email after this many failures",
+        )
+        parser.add_argument(
+            "--retry-delay",
+            type=float,
+            default=60,
+            help="Seconds before retrying a failed email, doubled on each failure",
+        )
+        parser.add_argument(
+            "--every",
+            type=float,
+            default=0,
+            help="Keep running and poll the outbox every given number of seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = failed = 0
+            while True:
+                batch_sent, batch_failed = self.send_batch(
+                    options["batch_size"],
+                    options["max_attempts"],
+                    timedelta(seconds=options["retry_delay"]),
+                )
+                sent += batch_sent
+                failed += batch_failed
+                # A batch of failures means the mail server is down,
+                # wait for the next poll instead of draining the outbox
+                if not batch_sent or batch_sent + batch_failed < options["batch_size"]:
+                    break
+            self.stdout.write(f"Sent {sent} emails, {failed} failed")
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
+
+    def claim(self, size):
+        """Mark the oldest due emails as sending and return them"""
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status__in=[OutboxEmail.PENDING, OutboxEmail.SENDING],
+                    next_attempt_at__lte=now,
+                )
+                .order_by("next_attempt_at")[:size]
+            )
+            OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+                status=OutboxEmail.SENDING,
+                attempts=F("attempts") + 1,
+                next_attempt_at=now + self.lease,
+            )
+        for email in emails:
+            email.attempts += 1
+        return emails
+
+    def send_batch(self, size, max_attempts, retry_delay):
+        """Send the oldest due emails, return the number of emails
+        sent and failed
+        """
+        emails = self.claim(size)
+        if not emails:
+            return 0, 0
+
+        attempted, errors = set(), {}
+        try:
+            with get_connection() as connection:
+                for email in emails:
+                    attempted.add(email.pk)
+                    try:
+                        connection.send_messages([email.as_message(connection)])
+                    except Exception as e:
+                        errors[email.pk] = e
+        except Exception as e:
+            # The mail server could not be reached, the emails not
+            # attempted yet count as failed
+            for email in emails:
+                if email.pk not in attempted:
+                    errors[email.pk] = e
+
+        now = timezone.now()
+        for email in emails:
+            error = errors.get(email.pk)
+            if error is None:
+                email.status = OutboxEmail.SENT
+                email.sent_at = now
+            elif email.attempts >= max_attempts:
+                email.status = OutboxEmail.FAILED
+                email.last_error = str(error)
+            else:
+                email.status = OutboxEmail.PENDING
+                email.last_error = str(error)
+                email.next_attempt_at = now + retry_delay * 2 ** (email.attempts - 1)
+        OutboxEmail.objects.bulk_update(
+            emails, ["status", "last_error", "next_attempt_at", "sent_at"]
+        )
+        return len(emails) - len(errors), len(errors)
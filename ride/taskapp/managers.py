@@ -0,0 +1,24 @@
+"""Task app managers"""
+
+# Django
+from django.db import models
+
+
+class OutboxEmailManager(models.Manager):
+    """Outbox email manager
+    Used to queue emails instead of sending them inside the request
+    """
+
+    def queue(self, subject, body, from_email, to, html_body=""):
+        """Queue an email for the send_queued_emails worker
+        The row is written in the current transaction, so the worker
+        only sees it once the transaction commits and never sends the
+        emails of a rolled back request
+        """
+        return self.create(
+            subject=subject,
+            body=body,
+            html_body=html_body,
+            from_email=from_email,
+            to=",".join(to),
+        )
@@ -0,0 +1,48 @@
+# Generated by Django 3.1.13 on 2026-10-18 03:58
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taskapp", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="outboxemail",
+            name="outbox_pending_idx",
+        ),
+        migrations.AddField(
+            model_name="outboxemail",
+            name="next_attempt_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                help_text="Pending emails are sent from this date on, sending ones are claimed again from it if their worker died",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="outboxemail",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("sending", "Sending"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=10,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="outboxemail",
+            index=models.Index(
+                condition=models.Q(status__in=["pending", "sending"]),
+                fields=["next_attempt_at"],
+                name="outbox_due_idx",
+            ),
+        ),
+    ]
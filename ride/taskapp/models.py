@@ -1 +1,76 @@
+"""Task app models"""
+
+# Django
+from django.core.mail import EmailMultiAlternatives
+from django.db import models
+from django.utils import timezone
+
+# Utilities
 from ride.utils.models import RideModel
+
+# Managers
+from ride.taskapp.managers import OutboxEmailManager
+
+
+class OutboxEmail(RideModel):
+    """Outbox email
+    An email waiting to be delivered by the send_queued_emails worker
+    """
+
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (SENDING, "Sending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255)
+    to = models.TextField(help_text="Comma separated recipients")
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text=(
+            "Pending emails are sent from this date on, sending ones are "
+            "claimed again from it if their worker died"
+        ),
+    )
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    # Manager
+    objects = OutboxEmailManager()
+
+    def __str__(self):
+        return f"{self.subject} to {self.to}"
+
+    def as_message(self, connection=None):
+        """Return the email ready to be sent through `connection`"""
+        message = EmailMultiAlternatives(
+            self.subject,
+            self.body,
+            self.from_email,
+            self.to.split(","),
+            connection=connection,
+        )
+        if self.html_body:
+            message.attach_alternative(self.html_body, "text/html")
+        return message
+
+    class Meta(RideModel.Meta):
+        ordering = ["created"]
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                name="outbox_due_idx",
+                condition=models.Q(status__in=["pending", "sending"]),
+            ),
+        ]
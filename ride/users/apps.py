@@ -5,3 +5,6 @@ class UsersAppConfig(AppConfig):
 
     name = "ride.users"
     verbose_name = "Users"
+
+    def ready(self):
+        from ride.users import signals  # noqa F401
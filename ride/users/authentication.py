@@ -0,0 +1,82 @@
+"""Users authentication"""
+
+# Django REST Framework
+from rest_framework.authentication import (
+    BaseAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+# Models
+from ride.users.models import User
+
+# Utilities
+from ride.users import tokens
+from ride.utils.cache import TieredCache
+
+tokens_cache = TieredCache("tokens", timeout=60)
+
+
+def forget_token(key):
+    """Invalidate the cached user of a token"""
+    tokens_cache.delete(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication resolving keys through the cache
+    Tokens and their users are kept in a local LRU in front of the shared
+    cache, so most requests authenticate without a query. Entries are
+    invalidated when the token is deleted or its user is saved, again
+    when that transaction commits, and expire after a minute in any case
+    """
+
+    def authenticate_credentials(self, key):
+        token = tokens_cache.get_or_set(
+            key, lambda: Token.objects.select_related("user").filter(key=key).first()
+        )
+        if token is None:
+            raise AuthenticationFailed("Invalid token.")
+        if not token.user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+        return (token.user, token)
+
+
+class JWTAuthentication(BaseAuthentication):
+    """Signed access token authentication
+    Clients send "Authorization: Bearer <access token>". The token is
+    verified with the signing keys and the revocation list, without any
+    database query, and request.user is a User holding only the pk,
+    username and status flags from the token: other fields must be read
+    from the database. Tokens are revoked when the user is deactivated or
+    changes password, so the flags are never staler than that.
+    request.auth is the token payload
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed("Invalid token header.")
+        try:
+            payload = tokens.decode(auth[1].decode(), tokens.ACCESS)
+        except (tokens.InvalidToken, UnicodeError) as e:
+            raise AuthenticationFailed(str(e))
+
+        user = User(
+            pk=int(payload["sub"]),
+            username=payload["username"],
+            is_active=payload.get("is_active", True),
+            is_staff=payload.get("is_staff", False),
+            is_superuser=payload.get("is_superuser", False),
+        )
+        user._state.adding = False
+        user._state.db = "default"
+        return (user, payload)
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -0,0 +1,27 @@
+# Generated by Django 3.1.13 on 2026-10-18 03:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_profile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="ratings_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of ratings the user has received"
+            ),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="ratings_sum",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Sum of the ratings the user has received"
+            ),
+        ),
+    ]
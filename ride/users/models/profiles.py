@@ -37,6 +37,12 @@ class Profile(RideModel):
     reputation = models.FloatField(
         default=5.0, help_text="User's reputations bases on the rides taken and offered"
     )
+    ratings_sum = models.PositiveIntegerField(
+        default=0, help_text="Sum of the ratings the user has received"
+    )
+    ratings_count = models.PositiveIntegerField(
+        default=0, help_text="Number of ratings the user has received"
+    )
 
     def __str__(self):
         return self.user.username
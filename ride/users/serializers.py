@@ -4,7 +4,6 @@ from datetime import timedelta
 # Django
 from django.contrib.auth import authenticate, password_validation
 from django.core.validators import RegexValidator
-from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils import timezone
@@ -16,6 +15,10 @@ from rest_framework.validators import UniqueValidator
 
 # Models
 from ride.users.models import User, Profile
+from ride.taskapp.models import OutboxEmail
+
+# Utilities
+from ride.users import tokens
 
 
 class ProfileModelSerializer(serializers.ModelSerializer):
@@ -42,6 +45,7 @@ class UserLoginSerializer(serializers.Serializer):
 
     email = serializers.EmailField()
     password = serializers.CharField(min_length=8, max_length=64)
+    token_type = serializers.ChoiceField(choices=("token", "jwt"), default="token")
 
     def validate(self, data):
         """Check credentials"""
@@ -54,8 +58,38 @@ class UserLoginSerializer(serializers.Serializer):
         return data
 
     def create(self, data):
-        token, created = Token.objects.get_or_create(user=self.context["user"])
-        return self.context["user"], token.key
+        """Return the user and its credentials, an API token or
+        a signed access and refresh token pair
+        """
+        user = self.context["user"]
+        if data["token_type"] == "jwt":
+            return user, tokens.issue_pair(user)
+        token, created = Token.objects.get_or_create(user=user)
+        return user, {"access_token": token.key}
+
+
+class RefreshTokenSerializer(serializers.Serializer):
+    """Exchange a refresh token for a new token pair
+    The refresh token is revoked, so each one can be used only once
+    """
+
+    refresh_token = serializers.CharField()
+
+    def validate_refresh_token(self, data):
+        try:
+            payload = tokens.decode(data, tokens.REFRESH)
+        except tokens.InvalidToken as e:
+            raise serializers.ValidationError(str(e))
+        user = User.objects.filter(pk=payload["sub"], is_active=True).first()
+        if user is None:
+            raise serializers.ValidationError("User inactive or deleted")
+        self.context["payload"] = payload
+        self.context["user"] = user
+        return data
+
+    def create(self, data):
+        tokens.revoke(self.context["payload"])
+        return tokens.issue_pair(self.context["user"])
 
 
 class UserSignUpSerializer(serializers.Serializer):
@@ -100,7 +134,7 @@ class UserSignUpSerializer(serializers.Serializer):
         return user
 
     def send_confirmation_email(self, user):
-        """Send account verification link to given user"""
+        """Queue the account verification link for the given user"""
         verification_token = self.generate_verification_email(user)
         subject = f"Welcome @{user.username} Verify your account to start using Ride"
         from_email = "ride <noreply@example.com>"
@@ -108,9 +142,9 @@ class UserSignUpSerializer(serializers.Serializer):
             "users/account_verification.html",
             {"token": verification_token, "user": user},
         )
-        msg = EmailMultiAlternatives(subject, content, from_email, [user.email])
-        msg.attach_alternative(content, "text/html")
-        msg.send()
+        OutboxEmail.objects.queue(
+            subject, content, from_email, [user.email], html_body=content
+        )
 
     def generate_verification_email(self, user):
         """Create JWT token that user can use to verify its account"""
@@ -0,0 +1,53 @@
+"""Users signals"""
+
+# Django
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# Django REST Framework
+from rest_framework.authtoken.models import Token
+
+# Models
+from ride.users.models import User
+
+# Authentication
+from ride.users import tokens
+from ride.users.authentication import forget_token
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def forget_changed_token(sender, instance, **kwargs):
+    """Invalidate the cached token when it is created or deleted"""
+    forget_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def forget_user_tokens(sender, instance, created, **kwargs):
+    """Invalidate the cached tokens of a user when the user changes,
+    e.g. when the account is deactivated
+    """
+    if created:
+        return
+    for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+        forget_token(key)
+
+
+@receiver(pre_save, sender=User)
+def revoke_user_tokens(sender, instance, update_fields=None, **kwargs):
+    """Revoke the signed tokens of a user that is deactivated or whose
+    password changes
+    """
+    if instance.pk is None:
+        return
+    if update_fields is not None and not {"password", "is_active"} & set(update_fields):
+        return
+    previous = (
+        User.objects.filter(pk=instance.pk).values("password", "is_active").first()
+    )
+    if previous is None:
+        return
+    if previous["password"] != instance.password or (
+        previous["is_active"] and not instance.is_active
+    ):
+        tokens.revoke_user(instance.pk)
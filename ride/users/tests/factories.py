@@ -0,0 +1,50 @@
+"""User factories"""
+
+from functools import lru_cache
+
+# Django
+from django.contrib.auth.hashers import make_password
+
+# Factory boy
+import factory
+from factory.django import DjangoModelFactory
+
+# Models
+from ride.users.models import User, Profile
+
+PASSWORD = "admin123."
+
+
+@lru_cache(maxsize=None)
+def hashed_password():
+    """Hash PASSWORD once, hashers are slow on purpose"""
+    return make_password(PASSWORD)
+
+
+class UserFactory(DjangoModelFactory):
+    """Verified client with a profile, its password is PASSWORD"""
+
+    username = factory.Sequence(lambda n: f"user{n}")
+    email = factory.LazyAttribute(lambda user: f"{user.username}@example.com")
+    first_name = factory.Faker("first_name")
+    last_name = factory.Faker("last_name")
+    phone = factory.Sequence(lambda n: f"+57{n:010d}")
+    password = factory.LazyFunction(hashed_password)
+    is_verified = True
+
+    profile = factory.RelatedFactory(
+        "ride.users.tests.factories.ProfileFactory", factory_related_name="user"
+    )
+
+    class Meta:
+        model = User
+
+
+class ProfileFactory(DjangoModelFactory):
+    """User profile"""
+
+    user = factory.SubFactory(UserFactory, profile=None)
+    biography = factory.Faker("sentence")
+
+    class Meta:
+        model = Profile
@@ -0,0 +1,78 @@
+"""Authentication tests"""
+
+# Django
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework.authtoken.models import Token
+
+# Authentication
+from ride.users.authentication import tokens_cache
+
+# Factories
+from ride.users.tests.factories import UserFactory
+
+
+class CachedTokenAuthenticationAPITestCase(APITestCase):
+    """Cached token authentication test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.user = UserFactory()
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+        # URL
+        self.url = f"/users/{self.user.username}/"
+
+    def queries(self):
+        """Return the queries run by a request to the user's profile"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [query["sql"] for query in context.captured_queries]
+
+    def test_token_is_cached(self):
+        """Only the first request looks the token up"""
+        self.assertTrue(any("authtoken_token" in sql for sql in self.queries()))
+        self.assertFalse(any("authtoken_token" in sql for sql in self.queries()))
+
+    def test_logout(self):
+        """A revoked token stops working right away"""
+        self.queries()
+        response = self.client.post("/users/logout/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user(self):
+        """A deactivated user stops being authenticated right away"""
+        self.queries()
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TokenCacheCommitAPITestCase(APITransactionTestCase):
+    """Token cache invalidation on commit test case"""
+
+    def test_deactivated_user_after_commit(self):
+        """A token cached by a concurrent request before the deactivation
+        commits stops working once it does
+        """
+        user = UserFactory()
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        url = f"/users/{user.username}/"
+        stale = Token.objects.select_related("user").get(key=token.key)
+        with transaction.atomic():
+            user.is_active = False
+            user.save()
+            # Another request reads the token before the commit
+            tokens_cache.get_or_set(token.key, lambda: stale)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,121 @@
+"""Sign up tests"""
+
+from io import StringIO
+from unittest import mock
+
+# Django
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Models
+from ride.taskapp.models import OutboxEmail
+
+
+class SignUpEmailAPITestCase(APITestCase):
+    """Sign up confirmation email test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.data = {
+            "email": "camilo@nunez.com",
+            "username": "camilo",
+            "phone": "1234567890",
+            "password": "admin.123",
+            "password_confirmation": "admin.123",
+            "first_name": "camilo",
+            "last_name": "nunez",
+        }
+
+    def send_queued_emails(self, **options):
+        """Run the outbox worker"""
+        call_command("send_queued_emails", stdout=StringIO(), **options)
+
+    def queue(self, count):
+        """Queue `count` emails"""
+        for i in range(count):
+            OutboxEmail.objects.queue("Hi", "Hello", "ride@example.com", [f"{i}@a.co"])
+
+    def mail_server_down(self):
+        """Make every delivery fail"""
+        return mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("Connection refused"),
+        )
+
+    def test_email_is_queued(self):
+        """Sign up queues the confirmation email instead of sending it"""
+        response = self.client.post("/users/signup/", self.data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.filter(status="pending").count(), 1)
+
+        self.send_queued_emails()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["camilo@nunez.com"])
+        self.assertIn("@camilo", mail.outbox[0].subject)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.SENT)
+        self.assertIsNotNone(email.sent_at)
+
+        # Sent emails are not sent again
+        self.send_queued_emails()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_failed_email_is_retried(self):
+        """Delivery errors are recorded and retried until max attempts"""
+        self.client.post("/users/signup/", self.data)
+        with self.mail_server_down():
+            for _ in range(5):
+                self.send_queued_emails()
+                # Skip the backoff
+                OutboxEmail.objects.update(next_attempt_at=timezone.now())
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.FAILED)
+        self.assertEqual(email.attempts, 5)
+        self.assertEqual(email.last_error, "Connection refused")
+
+    def test_outage_backs_off(self):
+        """A failed batch stops the run and is retried later, not right away"""
+        self.queue(3)
+        with self.mail_server_down():
+            self.send_queued_emails(batch_size=2)
+            self.assertEqual(
+                sorted(OutboxEmail.objects.values_list("attempts", flat=True)),
+                [0, 1, 1],
+            )
+            for email in OutboxEmail.objects.filter(attempts=1):
+                self.assertEqual(email.status, OutboxEmail.PENDING)
+                self.assertGreater(email.next_attempt_at, timezone.now())
+
+            # Only the email not attempted yet is due
+            self.send_queued_emails(batch_size=3)
+            self.assertEqual(OutboxEmail.objects.filter(attempts=1).count(), 3)
+
+            # Retried emails wait twice as long after each failure
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            before = timezone.now()
+            self.send_queued_emails(retry_delay=60)
+        for email in OutboxEmail.objects.all():
+            self.assertEqual(email.attempts, 2)
+            delay = email.next_attempt_at - before
+            self.assertGreaterEqual(delay.total_seconds(), 120)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_connection_error(self):
+        """Failing to reach the mail server counts against the batch"""
+        self.queue(2)
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.open",
+            side_effect=OSError("Connection refused"),
+        ):
+            self.send_queued_emails()
+        for email in OutboxEmail.objects.all():
+            self.assertEqual(email.status, OutboxEmail.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertEqual(email.last_error, "Connection refused")
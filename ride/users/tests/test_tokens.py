@@ -0,0 +1,142 @@
+"""Signed access tokens tests"""
+
+from unittest import mock
+
+# Django
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Factories
+from ride.users.tests.factories import PASSWORD, UserFactory
+
+# Utilities
+from ride.users.tokens import get_cache
+
+
+@override_settings(JWT_SIGNING_KEYS={"2021": "old secret"})
+class JWTLoginAPITestCase(APITestCase):
+    """JWT login mode test case"""
+
+    def setUp(self):
+        """Test case setup"""
+        self.user = UserFactory()
+
+        # URL
+        self.url = f"/users/{self.user.username}/"
+
+    def login(self):
+        """Log in asking for a signed token pair"""
+        response = self.client.post(
+            "/users/login/",
+            {"email": self.user.email, "password": PASSWORD, "token_type": "jwt"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def get(self, access_token):
+        """Retrieve the user's profile with a bearer token"""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        return self.client.get(self.url)
+
+    def test_login(self):
+        """Bearer tokens authenticate without looking anything up"""
+        tokens = self.login()
+        self.assertEqual(tokens["token_type"], "Bearer")
+        with CaptureQueriesContext(connection) as context:
+            response = self.get(tokens["access_token"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any("authtoken_token" in query["sql"] for query in context.captured_queries)
+        )
+
+    def test_refresh(self):
+        """Refresh tokens are exchanged for a new pair only once"""
+        tokens = self.login()
+        data = {"refresh_token": tokens["refresh_token"]}
+        response = self.client.post("/users/refresh/", data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            self.get(response.data["access_token"]).status_code, status.HTTP_200_OK
+        )
+
+        response = self.client.post("/users/refresh/", data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_access_token_is_not_a_refresh_token(self):
+        """Token types are not interchangeable"""
+        tokens = self.login()
+        response = self.client.post(
+            "/users/refresh/", {"refresh_token": tokens["access_token"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.get(tokens["refresh_token"])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout(self):
+        """Logging out revokes the access and refresh tokens"""
+        tokens = self.login()
+        self.get(tokens["access_token"])
+        response = self.client.post(
+            "/users/logout/", {"refresh_token": tokens["refresh_token"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = self.get(tokens["access_token"])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        response = self.client.post(
+            "/users/refresh/", {"refresh_token": tokens["refresh_token"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_key_rotation(self):
+        """Tokens signed with a retired key work until the key is removed"""
+        tokens = self.login()
+        keys = {"2022": "new secret", "2021": "old secret"}
+        with self.settings(JWT_SIGNING_KEYS=keys):
+            response = self.get(tokens["access_token"])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                self.get(self.login()["access_token"]).status_code, status.HTTP_200_OK
+            )
+        with self.settings(JWT_SIGNING_KEYS={"2022": "new secret"}):
+            response = self.get(tokens["access_token"])
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user(self):
+        """Deactivating a user revokes its tokens right away"""
+        tokens = self.login()
+        self.user.is_active = False
+        self.user.save()
+        response = self.get(tokens["access_token"])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        response = self.client.post(
+            "/users/refresh/", {"refresh_token": tokens["refresh_token"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_password_change(self):
+        """Changing the password revokes the tokens issued before"""
+        tokens = self.login()
+        self.user.set_password("admin456")
+        self.user.save()
+        response = self.get(tokens["access_token"])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.set_password(PASSWORD)
+        self.user.save()
+        self.client.credentials()
+        response = self.get(self.login()["access_token"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cache_down(self):
+        """Tokens are rejected when their revocation cannot be checked"""
+        tokens = self.login()
+        with mock.patch.object(get_cache(), "get_many", side_effect=ConnectionError):
+            response = self.get(tokens["access_token"])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,142 @@
+"""Signed access tokens
+
+Stateless JWT access and refresh tokens. They are verified with the
+signing keys alone, so any app node can authenticate a request without
+touching the database.
+
+Keys are rotated through JWT_SIGNING_KEYS, a mapping of key id to
+secret: new tokens are signed with JWT_SIGNING_KEY_ID (the first key by
+default) and carry its id in their header, while tokens signed with any
+other listed key stay valid until they expire or the key is removed.
+Revoked token ids are kept in the shared cache until the token expires,
+and so is the time before which every token of a user is rejected, set
+when the user is deactivated or changes password. A token that cannot
+be checked against the cache is rejected.
+"""
+
+import uuid
+
+# Django
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+# Utilities
+import jwt
+
+ALGORITHM = "HS256"
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+class InvalidToken(Exception):
+    """The token is malformed, expired, revoked or of the wrong type"""
+
+
+def get_signing_keys():
+    """Return the signing keys by id"""
+    return getattr(settings, "JWT_SIGNING_KEYS", None) or {
+        "default": settings.SECRET_KEY
+    }
+
+
+def get_signing_key_id():
+    """Return the id of the key that signs new tokens"""
+    return getattr(settings, "JWT_SIGNING_KEY_ID", None) or next(
+        iter(get_signing_keys())
+    )
+
+
+def get_cache():
+    """Return the cache holding the revocations
+    It must not ignore connection errors, see JWT_CACHE
+    """
+    return caches[getattr(settings, "JWT_CACHE", "default")]
+
+
+def issue(user, token_type):
+    """Return a signed token of `token_type` for `user`"""
+    if token_type == ACCESS:
+        lifetime = settings.JWT_ACCESS_TOKEN_LIFETIME
+    else:
+        lifetime = settings.JWT_REFRESH_TOKEN_LIFETIME
+    # Sub-second issue time, so tokens issued right after the user's
+    # tokens are revoked are told apart from the revoked ones
+    now = timezone.now().timestamp()
+    payload = {
+        "sub": str(user.pk),
+        "username": user.username,
+        "is_active": user.is_active,
+        "is_staff": user.is_staff,
+        "is_superuser": user.is_superuser,
+        "type": token_type,
+        "jti": uuid.uuid4().hex,
+        "iat": now,
+        "exp": int(now) + lifetime,
+    }
+    kid = get_signing_key_id()
+    return jwt.encode(
+        payload, get_signing_keys()[kid], algorithm=ALGORITHM, headers={"kid": kid}
+    )
+
+
+def issue_pair(user):
+    """Return a new access and refresh token pair for `user`"""
+    return {
+        "access_token": issue(user, ACCESS),
+        "refresh_token": issue(user, REFRESH),
+        "token_type": "Bearer",
+        "expires_in": settings.JWT_ACCESS_TOKEN_LIFETIME,
+    }
+
+
+def decode(token, token_type):
+    """Return the payload of a valid, unrevoked token of `token_type`"""
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = get_signing_keys()[kid]
+        payload = jwt.decode(token, key, algorithms=[ALGORITHM])
+    except (jwt.PyJWTError, KeyError):
+        raise InvalidToken("Invalid token")
+    if payload.get("type") != token_type:
+        raise InvalidToken("Invalid token")
+    if not payload.get("is_active", True):
+        raise InvalidToken("User inactive or deleted")
+
+    keys = [revoked_key(payload["jti"]), valid_after_key(payload["sub"])]
+    try:
+        revocations = get_cache().get_many(keys)
+    except Exception:
+        # Fail closed, the token may have been revoked
+        raise InvalidToken("Token could not be verified")
+    if revocations.get(keys[0]):
+        raise InvalidToken("Token has been revoked")
+    if payload["iat"] <= revocations.get(keys[1], 0):
+        raise InvalidToken("Token has been revoked")
+    return payload
+
+
+def revoked_key(jti):
+    return f"jwt:revoked:{jti}"
+
+
+def valid_after_key(user_id):
+    return f"jwt:valid_after:{user_id}"
+
+
+def revoke(payload):
+    """Reject the token of `payload` from now until it expires"""
+    timeout = payload["exp"] - int(timezone.now().timestamp())
+    if timeout > 0:
+        get_cache().set(revoked_key(payload["jti"]), 1, timeout)
+
+
+def revoke_user(user_id):
+    """Reject every token issued to a user until now
+    The entry outlives the longest lived token issued before it
+    """
+    get_cache().set(
+        valid_after_key(user_id),
+        timezone.now().timestamp(),
+        settings.JWT_REFRESH_TOKEN_LIFETIME,
+    )
@@ -15,6 +15,7 @@ from ride.users.permissions import IsAccountOwner
 # Serializer
 from ride.users.serializers import (
     UserLoginSerializer,
+    RefreshTokenSerializer,
     UserModelSerializer,
     UserSignUpSerializer,
     AccountVerificationSerializer,
@@ -23,12 +24,21 @@ from ride.users.serializers import (
 from ride.circles.serializers import CircleModelSerializer
 
 # Models
+from rest_framework.authtoken.models import Token
 from ride.users.models import User
 from ride.circles.models.circles import Circle
 
+# Utilities
+from ride.users import tokens
+from ride.utils.middleware import timed
+from ride.utils.views import SerializerTimingMixin
+
 
 class UserViewSet(
-    mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet
+    SerializerTimingMixin,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
+    viewsets.GenericViewSet,
 ):
     """User view set.
     Handle sign up, login and account verification
@@ -40,7 +50,7 @@ class UserViewSet(
 
     def get_permissions(self):
         """Assign permissions based on action"""
-        if self.action in ["signup", "login", "verify"]:
+        if self.action in ["signup", "login", "verify", "refresh"]:
             permissions = [AllowAny]
         elif self.action in ["retrive", "update", "partial_update", "profile"]:
             permissions = [IsAccountOwner, IsAuthenticated]
@@ -52,19 +62,45 @@ class UserViewSet(
     def login(self, request):
         serializer = UserLoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user, token = serializer.save()
+        user, credentials = serializer.save()
         data = {
-            "user": UserModelSerializer(user).data,
-            "access_token": token,
+            "user": timed(UserModelSerializer(user)).data,
+            **credentials,
         }
         return Response(data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=["post"])
+    def refresh(self, request):
+        """Exchange a refresh token for a new access and refresh token pair"""
+        serializer = RefreshTokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.save()
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"])
+    def logout(self, request):
+        """Revoke the requesting user's credentials"""
+        if isinstance(request.auth, dict):
+            # Signed access token, along with its refresh token if given
+            tokens.revoke(request.auth)
+            try:
+                refresh = tokens.decode(
+                    request.data.get("refresh_token", ""), tokens.REFRESH
+                )
+            except tokens.InvalidToken:
+                refresh = None
+            if refresh is not None and refresh["sub"] == request.auth["sub"]:
+                tokens.revoke(refresh)
+        else:
+            Token.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @action(detail=False, methods=["post"])
     def signup(self, request):
         serializer = UserSignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        data = UserModelSerializer(user).data
+        data = timed(UserModelSerializer(user)).data
         return Response(data, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=["post"])
@@ -83,7 +119,7 @@ class UserViewSet(
         serializer = ProfileModelSerializer(profile, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        data = UserModelSerializer(user).data
+        data = timed(UserModelSerializer(user)).data
         return Response(data)
 
     def retrieve(self, request, *args, **kwargs):
@@ -93,7 +129,7 @@ class UserViewSet(
         )
         data = {
             "user": response.data,
-            "circles": CircleModelSerializer(circles, many=True).data,
+            "circles": timed(CircleModelSerializer(circles, many=True)).data,
         }
         response.data = data
         return response
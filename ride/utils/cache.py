@@ -0,0 +1,104 @@
+"""Caching utilities"""
+
+import pickle
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+# Django
+from django.core.cache import cache
+from django.db import transaction
+
+_caches = weakref.WeakSet()
+
+
+class TieredCache:
+    """Two level cache
+    A small in-process LRU with a short TTL sits in front of the
+    configured django cache (Redis in production). Hot keys are served
+    without a network round trip, while deletes reach every other
+    process after at most `local_timeout` seconds.
+
+    Values are pickled on the way in, so callers always get their
+    own copy of a cached model instance. None is a valid value.
+    """
+
+    def __init__(self, prefix, timeout=300, local_timeout=5, maxsize=1024):
+        self.prefix = prefix
+        self.timeout = timeout
+        self.local_timeout = local_timeout
+        self.maxsize = maxsize
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    def make_key(self, key):
+        return f"{self.prefix}:{key}"
+
+    def get_or_set(self, key, default):
+        """Return the cached value of `key`, computing it by calling
+        `default` and caching the result on a miss
+        """
+        key = self.make_key(key)
+        found, value = self._get_local(key)
+        if found:
+            return value
+
+        data = cache.get(key)
+        if data is None:
+            value = default()
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            cache.set(key, data, self.timeout)
+        else:
+            value = pickle.loads(data)
+        self._set_local(key, data)
+        return value
+
+    def delete(self, key):
+        """Forget `key` in this process and in the shared cache
+        Inside a transaction the key is forgotten again once it commits,
+        as a concurrent request may have cached the old row in between
+        """
+        key = self.make_key(key)
+        self._delete(key)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self._delete(key))
+
+    def _delete(self, key):
+        with self._lock:
+            self._local.pop(key, None)
+        cache.delete(key)
+
+    def clear(self):
+        """Empty the in-process level"""
+        with self._lock:
+            self._local.clear()
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return False, None
+            expires, data = entry
+            if expires < time.monotonic():
+                del self._local[key]
+                return False, None
+            self._local.move_to_end(key)
+        return True, pickle.loads(data)
+
+    def _set_local(self, key, data):
+        if self.local_timeout <= 0:
+            return
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.local_timeout, data)
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+
+def clear_caches():
+    """Empty the shared cache and every in-process level"""
+    cache.clear()
+    for tiered in list(_caches):
+        tiered.clear()
@@ -0,0 +1,99 @@
+"""Stats counters
+
+Counters such as rides offered and taken are updated with single column
+UPDATE ... SET field = field + n statements, so concurrent requests never
+overwrite each other's increments.
+
+When COUNTERS_BUFFERED is enabled, increments are accumulated in Redis
+hashes once the request transaction commits and written to the database
+in batches by the flush_counters command. Hot circles then get one UPDATE
+per flush instead of one per ride.
+"""
+
+from collections import defaultdict
+from uuid import uuid4
+
+# Django
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+# Redis
+from redis.exceptions import ResponseError
+
+PENDING_KEY = "counters:pending"
+
+
+def increment(model, pk, *fields, by=1):
+    """Add `by` to each of the counter `fields` of a row"""
+    if getattr(settings, "COUNTERS_BUFFERED", False):
+        transaction.on_commit(lambda: buffer(model, pk, fields, by))
+    else:
+        model.objects.filter(pk=pk).update(**{f: F(f) + by for f in fields})
+
+
+def get_redis():
+    """Return the Redis client behind the default cache"""
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+def buffer_key(model, field):
+    """Return the Redis hash holding the pending increments of a field"""
+    return f"counters:{model._meta.label_lower}:{field}"
+
+
+def buffer(model, pk, fields, by):
+    """Accumulate increments in Redis until the next flush"""
+    pipe = get_redis().pipeline()
+    for field in fields:
+        key = buffer_key(model, field)
+        pipe.hincrby(key, pk, by)
+        pipe.sadd(PENDING_KEY, key)
+    pipe.execute()
+
+
+def flush():
+    """Write the buffered increments to the database
+    Rows sharing the same increment are updated with a single statement.
+    Return the number of rows updated
+    """
+    redis = get_redis()
+    updated = 0
+    for key in redis.smembers(PENDING_KEY):
+        key = key.decode()
+        # Unique per run, so overlapping flushes never share a snapshot
+        snapshot = f"{key}:flushing:{uuid4().hex}"
+        redis.srem(PENDING_KEY, key)
+        # Increments arriving from now on go to a fresh hash. An
+        # overlapping flush may have taken the hash since SMEMBERS
+        try:
+            redis.rename(key, snapshot)
+        except ResponseError:
+            continue
+        deltas = redis.hgetall(snapshot)
+
+        _, label, field = key.split(":")
+        model = apps.get_model(label)
+        pks = defaultdict(list)
+        for pk, delta in deltas.items():
+            pks[int(delta)].append(int(pk))
+        try:
+            with transaction.atomic():
+                for delta, group in pks.items():
+                    updated += model.objects.filter(pk__in=group).update(
+                        **{field: F(field) + delta}
+                    )
+        except Exception:
+            # Give the increments back so the next flush retries them
+            pipe = redis.pipeline()
+            for pk, delta in deltas.items():
+                pipe.hincrby(key, pk, int(delta))
+            pipe.sadd(PENDING_KEY, key)
+            pipe.execute()
+            raise
+        finally:
+            redis.delete(snapshot)
+    return updated
@@ -0,0 +1,118 @@
+"""Geospatial utilities
+
+Rides are indexed by the geohash cell of their departure and arrival
+points. A geohash is a base 32 string where every extra character splits
+the parent cell into 32 smaller ones, so points that are close together
+share the same cell and a radius search becomes an exact match over the
+handful of cells that cover the radius.
+"""
+
+from math import asin, cos, radians, sin, sqrt
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Cells of 5 characters are about 4.9km x 4.9km at the equator
+CELL_PRECISION = 5
+
+EARTH_RADIUS = 6371.0088  # km
+KM_PER_DEGREE = 111.32
+
+# Largest radius that can be covered by a single search
+MAX_RADIUS = 25  # km
+
+
+def encode(latitude, longitude, precision=CELL_PRECISION):
+    """Return the geohash of a point with the given number of characters"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit = 0
+    even = True
+    while len(geohash) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= mid:
+                bits = bits * 2 + 1
+                lng_range[0] = mid
+            else:
+                bits = bits * 2
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = bits * 2 + 1
+                lat_range[0] = mid
+            else:
+                bits = bits * 2
+                lat_range[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            geohash.append(BASE32[bits])
+            bits = 0
+            bit = 0
+    return "".join(geohash)
+
+
+def cell_for(latitude, longitude):
+    """Return the index cell of a point or an empty string if it has no coordinates"""
+    if latitude is None or longitude is None:
+        return ""
+    return encode(latitude, longitude)
+
+
+def cell_size(precision=CELL_PRECISION):
+    """Return the (latitude, longitude) size in degrees of a cell"""
+    lng_bits = (precision * 5 + 1) // 2
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def cells_around(latitude, longitude, radius, precision=CELL_PRECISION):
+    """Return the cells that cover a circle of `radius` km around a point"""
+    lat_step, lng_step = cell_size(precision)
+    lat_delta = radius / KM_PER_DEGREE
+    lng_delta = radius / (KM_PER_DEGREE * max(cos(radians(latitude)), 0.01))
+
+    south = max(latitude - lat_delta, -90.0)
+    north = min(latitude + lat_delta, 90.0)
+    west = longitude - lng_delta
+    east = longitude + lng_delta
+
+    cells = set()
+    lat = south
+    while True:
+        lng = west
+        while True:
+            wrapped = (lng + 180.0) % 360.0 - 180.0
+            cells.add(encode(lat, wrapped, precision))
+            if lng >= east:
+                break
+            lng = min(lng + lng_step, east)
+        if lat >= north:
+            break
+        lat = min(lat + lat_step, north)
+    return cells
+
+
+def distance(lat_a, lng_a, lat_b, lng_b):
+    """Return the great circle distance in km between two points"""
+    lat_a, lng_a, lat_b, lng_b = map(radians, (lat_a, lng_a, lat_b, lng_b))
+    h = (
+        sin((lat_b - lat_a) / 2) ** 2
+        + cos(lat_a) * cos(lat_b) * sin((lng_b - lng_a) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(h)))
+
+
+def detour(start, end, pickup, dropoff):
+    """Return the extra km of going from `start` to `end` through
+    `pickup` and then `dropoff`, points being (latitude, longitude) pairs
+    """
+    through = (
+        distance(*start, *pickup)
+        + distance(*pickup, *dropoff)
+        + distance(*dropoff, *end)
+    )
+    return max(through - distance(*start, *end), 0.0)
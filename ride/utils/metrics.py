@@ -0,0 +1,83 @@
+"""Request metrics
+
+An in-process registry of the queries and timings of every API action,
+keyed by view and action, e.g. RideViewSet.join. Figures are kept per
+worker process and reset on restart.
+"""
+
+import threading
+from collections import defaultdict
+
+_lock = threading.Lock()
+_endpoints = defaultdict(
+    lambda: {
+        "requests": 0,
+        "queries": 0,
+        "max_queries": 0,
+        "db_time": 0.0,
+        "view_time": 0.0,
+        "serializer_time": 0.0,
+        "render_time": 0.0,
+        "total_time": 0.0,
+        "max_total_time": 0.0,
+    }
+)
+_over_budget = []
+
+
+def record(
+    endpoint, queries, db_time, view_time, serializer_time, render_time, total_time
+):
+    """Add a request to the figures of `endpoint`, times in seconds"""
+    with _lock:
+        stats = _endpoints[endpoint]
+        stats["requests"] += 1
+        stats["queries"] += queries
+        stats["max_queries"] = max(stats["max_queries"], queries)
+        stats["db_time"] += db_time
+        stats["view_time"] += view_time
+        stats["serializer_time"] += serializer_time
+        stats["render_time"] += render_time
+        stats["total_time"] += total_time
+        stats["max_total_time"] = max(stats["max_total_time"], total_time)
+
+
+def snapshot():
+    """Return the averages of every endpoint, times in milliseconds"""
+    with _lock:
+        endpoints = {name: dict(stats) for name, stats in _endpoints.items()}
+    report = {}
+    for name, stats in sorted(endpoints.items()):
+        requests = stats["requests"]
+        report[name] = {
+            "requests": requests,
+            "queries": round(stats["queries"] / requests, 2),
+            "max_queries": stats["max_queries"],
+            "db_ms": round(stats["db_time"] * 1000 / requests, 3),
+            "view_ms": round(stats["view_time"] * 1000 / requests, 3),
+            "serializer_ms": round(stats["serializer_time"] * 1000 / requests, 3),
+            "render_ms": round(stats["render_time"] * 1000 / requests, 3),
+            "total_ms": round(stats["total_time"] * 1000 / requests, 3),
+            "max_total_ms": round(stats["max_total_time"] * 1000, 3),
+        }
+    return report
+
+
+def reset():
+    """Forget every recorded request"""
+    with _lock:
+        _endpoints.clear()
+
+
+def over_budget(message):
+    """Keep a query budget violation until pop_over_budget"""
+    with _lock:
+        _over_budget.append(message)
+
+
+def pop_over_budget():
+    """Return and forget the query budget violations"""
+    with _lock:
+        messages = list(_over_budget)
+        _over_budget.clear()
+    return messages
@@ -0,0 +1,158 @@
+"""Middleware"""
+
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+# Django
+from django.conf import settings
+from django.db import connections
+
+# Utilities
+from ride.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Recorder of the request being served by the current thread
+_local = threading.local()
+
+
+class QueryRecorder:
+    """Database execute wrapper counting queries and their time, along
+    with the time spent reading serializers' data
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - start
+            self.queries += 1
+
+
+@contextmanager
+def serializing():
+    """Add the time spent in the block to the serializer time of the
+    request being served. Nested blocks are timed with the outermost one
+    """
+    recorder = getattr(_local, "recorder", None)
+    if recorder is None or recorder.serializing:
+        yield
+        return
+    recorder.serializing = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.serializer_time += time.perf_counter() - start
+        recorder.serializing = False
+
+
+_timed_classes = {}
+
+
+def timed(serializer):
+    """Return `serializer` with the reading of its data timed as
+    serializer time, see serializing
+    """
+    cls = type(serializer)
+    if cls.__dict__.get("timed"):
+        return serializer
+    timed_class = _timed_classes.get(cls)
+    if timed_class is None:
+
+        def data(self):
+            with serializing():
+                return super(timed_class, self).data
+
+        timed_class = type(
+            cls.__name__, (cls,), {"data": property(data), "timed": True}
+        )
+        _timed_classes[cls] = timed_class
+    serializer.__class__ = timed_class
+    return serializer
+
+
+class QueryMetricsMiddleware:
+    """Record the query count and timings of every API action
+    Timings are split into database time, serializer time (reading the
+    data of the serializers views wrap with `timed`, see
+    SerializerTimingMixin), view time (the rest of the action) and
+    render time (the response encoding).
+
+    Views may declare a `query_budgets` mapping of action to the number
+    of queries it is expected to run. Going over budget logs a warning
+    and, when QUERY_BUDGETS_STRICT is set, fails the test that made the
+    request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        _local.recorder = recorder
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(recorder))
+                response = self.get_response(request)
+        finally:
+            _local.recorder = None
+        total_time = time.perf_counter() - start
+
+        endpoint, budget = self.get_endpoint(request, response)
+        if endpoint is None:
+            return response
+
+        end = start + total_time
+        view_start = getattr(request, "_metrics_view_start", start)
+        view_end = getattr(request, "_metrics_view_end", end)
+        metrics.record(
+            endpoint,
+            queries=recorder.queries,
+            db_time=recorder.time,
+            view_time=view_end - view_start - recorder.serializer_time,
+            serializer_time=recorder.serializer_time,
+            render_time=end - view_end,
+            total_time=total_time,
+        )
+
+        if budget is not None and recorder.queries > budget:
+            message = f"{endpoint} ran {recorder.queries} queries, budget is {budget}"
+            logger.warning(message)
+            if getattr(settings, "QUERY_BUDGETS_STRICT", False):
+                metrics.over_budget(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view_start = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF responses render after the view returns
+        request._metrics_view_end = time.perf_counter()
+        return response
+
+    def get_endpoint(self, request, response):
+        """Return the name of the action that served the request and
+        its query budget
+        """
+        context = getattr(response, "renderer_context", None) or {}
+        view = context.get("view")
+        if view is not None:
+            action = getattr(view, "action", None) or request.method.lower()
+            budget = getattr(view, "query_budgets", {}).get(action)
+            return f"{view.__class__.__name__}.{action}", budget
+        match = getattr(request, "resolver_match", None)
+        if match is not None:
+            return match.view_name, None
+        return None, None
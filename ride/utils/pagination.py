@@ -0,0 +1,159 @@
+"""Pagination classes"""
+
+import base64
+import json
+from collections import OrderedDict
+from types import SimpleNamespace
+
+# Django
+from django.db.models import Q
+
+# Django REST Framework
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (cursor) pagination
+    Pages are fetched with a WHERE (a, b) > (last a, last b) seek on the
+    `keyset` columns of the view instead of an OFFSET, so every page costs
+    the same as the first one when an index covers the keyset. The last
+    column must be unique, usually the primary key.
+
+    The total count is included unless the client asks for `count=false`.
+    Querysets of .values() rows must select the keyset columns.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    count_query_param = "count"
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    keyset = ("-created", "id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = tuple(getattr(view, "keyset", self.keyset))
+        self.fields = [self.get_field(queryset.model, key) for key in self.keyset]
+        self.page_size = self.get_page_size(request)
+
+        self.count = queryset.count() if self.include_count(request) else None
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[1]
+        if cursor is not None:
+            queryset = queryset.filter(self.seek(cursor[0], reverse))
+
+        ordering = [self.flip(key) if reverse else key for key in self.keyset]
+        results = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if results:
+            self.first = self.get_position(results[0])
+            self.last = self.get_position(results[-1])
+        else:
+            self.first = self.last = cursor and cursor[0]
+        self.has_next = has_more if not reverse else cursor is not None
+        self.has_previous = has_more if reverse else cursor is not None
+        return results
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.count is not None:
+            response["count"] = self.count
+        response["next"] = self.get_next_link()
+        response["previous"] = self.get_previous_link()
+        response["results"] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def include_count(self, request):
+        value = request.query_params.get(self.count_query_param, "true")
+        return value.lower() not in ("0", "false", "no")
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.first, reverse=True)
+
+    def get_field(self, model, key):
+        name = key.lstrip("-")
+        return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+    def flip(self, key):
+        return key[1:] if key.startswith("-") else f"-{key}"
+
+    def get_position(self, instance):
+        """Return the keyset values of `instance` as strings"""
+        if isinstance(instance, dict):
+            instance = SimpleNamespace(**instance)
+        return [field.value_to_string(instance) for field in self.fields]
+
+    def seek(self, position, reverse):
+        """Return the lookup of the rows after `position`
+        (a, b) > (x, y) is spelled a > x OR (a = x AND b > y)
+        """
+        values = [field.to_python(value) for field, value in zip(self.fields, position)]
+        seek = Q()
+        for i, key in enumerate(self.keyset):
+            descending = key.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            condition = Q(**{f"{key.lstrip('-')}__{lookup}": values[i]})
+            for previous, value in zip(self.keyset[:i], values):
+                condition &= Q(**{previous.lstrip("-"): value})
+            seek |= condition
+        return seek
+
+    def encode_cursor(self, position, reverse):
+        data = {"p": position}
+        if reverse:
+            data["r"] = 1
+        cursor = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """Return the (position, reverse) pair of the request's cursor"""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            position = data["p"]
+            reverse = bool(data.get("r"))
+            if len(position) != len(self.fields):
+                raise ValueError
+            for field, value in zip(self.fields, position):
+                field.to_python(value)
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
@@ -0,0 +1,75 @@
+"""JSON renderer and parser backed by orjson
+
+Drop-in replacements for DRF's JSONRenderer and JSONParser producing the
+same bytes several times faster. When orjson is not installed, or a
+request asks for something orjson cannot do (indented output, ASCII only
+output, a charset other than UTF-8, integers over 64 bits), they fall back
+to the stock stdlib implementation. Floats are the one known difference:
+orjson writes 1e16 where the stdlib writes 1e+16, and NaN as null.
+
+Values orjson does not know natively, and datetimes, go through DRF's
+encoder so they are formatted exactly as before.
+"""
+
+import codecs
+
+# Django REST Framework
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """orjson JSON renderer"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same as DRF, escape the separators javascript does not allow
+        # in strings
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """orjson JSON parser"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", "utf-8")
+        if orjson is None or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        data = stream.read()
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+        # Let the stdlib decide, it also takes integers over 64 bits and
+        # NaN when not strict, and reports errors as usual
+        parse_constant = json.strict_constant if self.strict else None
+        try:
+            return json.loads(data.decode(encoding), parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
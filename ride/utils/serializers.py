@@ -0,0 +1,199 @@
+"""Compiled read only serializers
+
+A ModelSerializer builds its field tree for every use and reads model
+instances attribute by attribute, which dominates the cost of long
+listings. A compiled serializer walks the fields of a ModelSerializer
+once, turns them into the .values() columns they read, and builds the
+same output straight from the rows, without model instances.
+
+Nested serializers are read from the same row through joins, nested lists
+take one extra query for the whole page.
+"""
+
+from collections import defaultdict
+
+# Django
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db.models import F
+
+# Django REST Framework
+from rest_framework import serializers
+
+VALUE = "value"
+NESTED = "nested"
+MANY = "many"
+
+# Column of the parent's primary key in the rows of nested lists
+PARENT = "_parent_pk"
+
+
+def resolve(model, path):
+    """Return the model field at the end of a lookup `path`"""
+    names = path.split("__")
+    for name in names[:-1]:
+        model = model._meta.get_field(name).related_model
+    name = names[-1]
+    return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+
+def file_converter(field, model_field, request):
+    """Return the converter of a file field, the same as DRF's
+    FileField.to_representation without a FieldFile per row
+    """
+    if not getattr(field, "use_url", True):
+        return lambda name: name or None
+
+    storage = model_field.storage
+
+    def convert(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    return convert
+
+
+class Plan:
+    """The columns a serializer reads and how each output key is built
+
+    `strings` maps the lookup of every StringRelatedField to the column
+    holding its string, e.g. {"offered_in": "offered_in__name"}
+    """
+
+    def __init__(self, serializer, strings, prefix=""):
+        self.model = serializer.Meta.model
+        self.pk = f"{prefix}{self.model._meta.pk.name}"
+        self.columns = [self.pk]
+        self.entries = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == "*" or "." in field.source:
+                raise ImproperlyConfigured(
+                    f"{serializer.__class__.__name__}.{name} is not a model field"
+                )
+            lookup = f"{prefix}{field.source}"
+            model_field = resolve(self.model, field.source)
+
+            if isinstance(field, serializers.ListSerializer):
+                if prefix:
+                    raise ImproperlyConfigured(
+                        f"Nested list {lookup} must be a top level field"
+                    )
+                if model_field.many_to_many and not model_field.auto_created:
+                    query_name = model_field.related_query_name()
+                else:
+                    query_name = model_field.field.name
+                child = Plan(field.child, strings)
+                self.entries.append((MANY, name, query_name, child))
+
+            elif isinstance(field, serializers.BaseSerializer):
+                child = Plan(field, strings, f"{lookup}__")
+                self.columns += child.columns
+                self.entries.append((NESTED, name, child.pk, child))
+
+            elif isinstance(field, serializers.StringRelatedField):
+                if lookup not in strings:
+                    raise ImproperlyConfigured(f"No string column given for {lookup}")
+                self.columns.append(strings[lookup])
+                self.entries.append(
+                    (VALUE, name, strings[lookup], field.to_representation)
+                )
+
+            elif isinstance(field, serializers.RelatedField):
+                raise ImproperlyConfigured(f"Related field {lookup} is not supported")
+
+            else:
+                self.columns.append(lookup)
+                self.entries.append((VALUE, name, lookup, (field, model_field)))
+
+    def bind(self, request, pks=()):
+        """Return the entries with their converters for `request`, with
+        the nested lists of the `pks` rows already fetched
+        """
+        bound = []
+        for kind, name, column, spec in self.entries:
+            if kind == NESTED:
+                spec = spec.bind(request)
+            elif kind == MANY:
+                spec = self.fetch(column, spec, request, pks)
+                column = self.pk
+            elif isinstance(spec, tuple):
+                field, model_field = spec
+                if isinstance(model_field, models.FileField):
+                    spec = file_converter(field, model_field, request)
+                else:
+                    spec = field.to_representation
+            bound.append((kind, name, column, spec))
+        return bound
+
+    def fetch(self, query_name, child, request, pks):
+        """Return the output of a nested list grouped by parent pk"""
+        groups = defaultdict(list)
+        if not pks:
+            return groups
+        rows = child.model.objects.filter(**{f"{query_name}__in": pks}).values(
+            *child.columns, **{PARENT: F(query_name)}
+        )
+        bound = child.bind(request)
+        for row in rows:
+            groups[row[PARENT]].append(build(bound, row))
+        return groups
+
+
+def build(bound, row):
+    """Return the output of a bound plan for a .values() row"""
+    data = {}
+    for kind, name, column, spec in bound:
+        value = row[column]
+        if kind == MANY:
+            data[name] = spec.get(value, [])
+        elif value is None:
+            data[name] = None
+        elif kind == NESTED:
+            data[name] = build(spec, row)
+        else:
+            data[name] = spec(value)
+    return data
+
+
+class CompiledSerializer:
+    """Read only serializer with the output of `serializer_class`
+    Feed it rows of a queryset passed through `prepare`. StringRelatedFields
+    need the column of their string in `related_strings`
+    """
+
+    serializer_class = None
+    related_strings = {}
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @classmethod
+    def get_plan(cls):
+        """Compile the serializer on first use"""
+        plan = cls.__dict__.get("_plan")
+        if plan is None:
+            plan = cls._plan = Plan(cls.serializer_class(), cls.related_strings)
+        return plan
+
+    @classmethod
+    def prepare(cls, queryset):
+        """Return the rows of `queryset` the serializer reads"""
+        columns = dict.fromkeys(cls.get_plan().columns)
+        return queryset.values(*columns)
+
+    @property
+    def data(self):
+        plan = self.get_plan()
+        rows = self.instance if self.many else [self.instance]
+        pks = [row[plan.pk] for row in rows]
+        bound = plan.bind(self.context.get("request"), pks)
+        results = [build(bound, row) for row in rows]
+        return results if self.many else results[0]
@@ -0,0 +1,34 @@
+"""Utility views"""
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# Utilities
+from ride.utils import metrics
+from ride.utils.middleware import timed
+
+
+class MetricsView(APIView):
+    """Per action query and latency figures of this process"""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(metrics.snapshot())
+
+    def delete(self, request, *args, **kwargs):
+        metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class SerializerTimingMixin:
+    """Report the time spent reading serializers' data as serializer
+    time in the request metrics. Serializers built by get_serializer are
+    timed, views wrap the ones they build themselves with `timed`
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        return timed(super().get_serializer(*args, **kwargs))